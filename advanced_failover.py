@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import threading
@@ -15,6 +14,7 @@ from config import (
     CLOUD_PROVIDERS
 )
 from health_check import get_current_health_status
+from json_files import file_version, read_json_cached, to_json, write_json_atomic
 from db_manager import db_manager
 
 # Setup logging
@@ -41,6 +41,7 @@ class AdvancedFailoverManager:
             self._save_active_provider(DEFAULT_PROVIDER)
         
         self.active_provider = self._load_active_provider()
+        self._active_provider_version = file_version(ACTIVE_PROVIDER_FILE)
         
         # Track health status history for better decision making
         self.health_history = {provider: [] for provider in CLOUD_PROVIDERS.keys()}
@@ -76,26 +77,39 @@ class AdvancedFailoverManager:
         from performance_monitor import get_performance_data
         self.current_performance = get_performance_data()
         
+        # Monitoring thread state, see start_monitoring
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
     def _load_active_provider(self):
         """Load the active provider from file"""
         try:
             if os.path.exists(ACTIVE_PROVIDER_FILE):
-                with open(ACTIVE_PROVIDER_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get('active_provider', DEFAULT_PROVIDER)
+                data = read_json_cached(ACTIVE_PROVIDER_FILE)
+                return data.get('active_provider', DEFAULT_PROVIDER)
             return DEFAULT_PROVIDER
         except Exception as e:
             logger.error(f"Failed to load active provider: {str(e)}")
             return DEFAULT_PROVIDER
     
+    def _current_provider(self):
+        """Return the active provider, re-reading the file only if another manager changed it"""
+        version = file_version(ACTIVE_PROVIDER_FILE)
+        if version != self._active_provider_version:
+            self.active_provider = self._load_active_provider()
+            self._active_provider_version = version
+        return self.active_provider
+    
     def _save_active_provider(self, provider):
         """Save the active provider to file"""
         try:
-            with open(ACTIVE_PROVIDER_FILE, 'w') as f:
-                json.dump({
-                    'active_provider': provider,
-                    'updated_at': datetime.now().isoformat()
-                }, f)
+            write_json_atomic(ACTIVE_PROVIDER_FILE, {
+                'active_provider': provider,
+                'updated_at': datetime.now().isoformat()
+            })
+            # Our own write isn't an outside change
+            self._active_provider_version = file_version(ACTIVE_PROVIDER_FILE)
         except Exception as e:
             logger.error(f"Failed to save active provider: {str(e)}")
     
@@ -136,21 +150,31 @@ class AdvancedFailoverManager:
     
     def calculate_provider_score(self, provider, health_status):
         """Calculate a score for each provider based on multiple factors"""
-        # Base score starts at 0
-        score = 0
+        return self.calculate_provider_score_breakdown(provider, health_status)['total']
+    
+    def calculate_provider_score_breakdown(self, provider, health_status):
+        """Calculate a provider's score along with the points from each factor"""
+        breakdown = {
+            'health': 0,
+            'history': 0,
+            'performance': 0,
+            'failover_penalty': 0,
+            'cost': 0,
+            'total': 0
+        }
         
         # 1. Current health status (most important)
         is_healthy = provider in health_status and health_status[provider].get('status', False)
         if is_healthy:
-            score += 50  # Big boost for being currently healthy
+            breakdown['health'] = 50  # Big boost for being currently healthy
         else:
-            return 0  # Immediately disqualify unhealthy providers
+            return breakdown  # Immediately disqualify unhealthy providers
         
         # 2. Recent health history (reliability)
         if provider in self.health_history and self.health_history[provider]:
             history = self.health_history[provider]
             recent_health_ratio = sum(1 for status in history if status['healthy']) / len(history)
-            score += 20 * recent_health_ratio * self.provider_weights[provider]['reliability']
+            breakdown['history'] = 20 * recent_health_ratio * self.provider_weights[provider]['reliability']
         
         # 3. Performance metrics
         if provider in self.current_performance:
@@ -164,15 +188,14 @@ class AdvancedFailoverManager:
             success_rate = perf.get('request_success_rate', 95) / 100  # As ratio
             success_score = success_rate * 10  # 0-10 points
             
-            performance_score = (response_score + success_score) * self.provider_weights[provider]['performance']
-            score += performance_score
+            breakdown['performance'] = (response_score + success_score) * self.provider_weights[provider]['performance']
         
         # 4. Failover timing - avoid too frequent failovers to the same provider
         if provider in self.last_failover_time and self.last_failover_time[provider] is not None:
             time_since_last_failover = (datetime.now() - self.last_failover_time[provider]).total_seconds()
             if time_since_last_failover < self.recovery_time_threshold:
                 # Reduce score if we recently failed over from this provider
-                score -= 15
+                breakdown['failover_penalty'] = -15
         
         # 5. Cost factors
         if provider in CLOUD_PROVIDERS:
@@ -190,10 +213,14 @@ class AdvancedFailoverManager:
             else:
                 cost_score = 5  # Equal costs
                 
-            score += cost_score * self.provider_weights[provider]['cost']
+            breakdown['cost'] = cost_score * self.provider_weights[provider]['cost']
         
-        logger.debug(f"Provider {provider} score: {score}")
-        return score
+        breakdown['total'] = (
+            breakdown['health'] + breakdown['history'] + breakdown['performance']
+            + breakdown['failover_penalty'] + breakdown['cost']
+        )
+        logger.debug("Provider %s score: %s", provider, breakdown['total'])
+        return breakdown
     
     def select_best_provider(self, health_status, exclude_providers=None):
         """Select the best provider based on multiple factors"""
@@ -237,7 +264,7 @@ class AdvancedFailoverManager:
             self.update_health_history(health_status)
             
             # Get current active provider
-            current_provider = self._load_active_provider()
+            current_provider = self._current_provider()
             
             # Check if current provider needs failover
             needs_failover = False
@@ -352,6 +379,8 @@ class AdvancedFailoverManager:
     
     def _log_failover_event(self, from_provider, to_provider, reason=None, is_manual=False):
         """Log a failover event"""
+        # Fetch health once for all providers' scores
+        health_status = get_current_health_status()
         event = {
             'timestamp': datetime.now().isoformat(),
             'event': 'failover',
@@ -360,7 +389,7 @@ class AdvancedFailoverManager:
             'reason': reason if reason else 'Not specified',
             'is_manual': is_manual,
             'scores': {
-                provider: self.calculate_provider_score(provider, get_current_health_status())
+                provider: self.calculate_provider_score(provider, health_status)
                 for provider in CLOUD_PROVIDERS.keys()
             }
         }
@@ -379,19 +408,19 @@ class AdvancedFailoverManager:
             reason=reason,
             is_manual=is_manual,
             triggered_by='advanced_system' if not is_manual else 'user',
-            details=json.dumps(details)
+            details=details
         )
         
         # Also log event to failover log file as backup
         try:
             with open(FAILOVER_LOG_FILE, 'a') as f:
-                f.write(json.dumps(event) + '\n')
+                f.write(to_json(event) + '\n')
         except Exception as e:
             logger.error(f"Failed to log failover event to file: {str(e)}")
     
     def run_failover_check_thread(self, interval=10):
         """Run failover checks in a loop at specified intervals"""
-        while True:
+        while not self._stop_event.is_set():
             # Update performance data
             from performance_monitor import get_performance_data
             self.current_performance = get_performance_data()
@@ -400,27 +429,37 @@ class AdvancedFailoverManager:
             self.check_and_failover()
             
             # Wait for next check
-            time.sleep(interval)
+            self._stop_event.wait(interval)
     
     def start_monitoring(self, interval=10):
         """Start failover monitoring in a background thread"""
-        # Initialize with current health data
-        health_status = get_current_health_status()
-        if health_status:
-            self.update_health_history(health_status)
-        
-        failover_thread = threading.Thread(
-            target=self.run_failover_check_thread,
-            args=(interval,),
-            daemon=True
-        )
-        failover_thread.start()
+        with self._start_lock:
+            # Only ever run one monitoring thread per manager
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            
+            # Initialize with current health data
+            health_status = get_current_health_status()
+            if health_status:
+                self.update_health_history(health_status)
+            
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self.run_failover_check_thread,
+                args=(interval,),
+                daemon=True
+            )
+            self._thread.start()
         logger.info(f"Advanced failover monitoring started in background thread (interval: {interval}s)")
-        return failover_thread
+        return self._thread
+    
+    def stop(self):
+        """Ask the monitoring thread to exit after its current check"""
+        self._stop_event.set()
     
     def manual_failover(self, to_provider, reason="Manual failover"):
         """Manually trigger failover to specified provider"""
-        current_provider = self._load_active_provider()
+        current_provider = self._current_provider()
         
         if current_provider == to_provider:
             logger.info(f"Provider {to_provider} is already active. No failover needed.")
@@ -445,7 +484,7 @@ class AdvancedFailoverManager:
         """Simulate a disaster scenario for testing"""
         # Get current health status
         health_status = get_current_health_status()
-        current_provider = self._load_active_provider()
+        current_provider = self._current_provider()
         
         if scenario == "random":
             # Randomly select a scenario
@@ -475,22 +514,27 @@ class AdvancedFailoverManager:
             
             # Temporarily modify performance data
             if current_provider in self.current_performance:
-                # Make a copy of the original performance data
-                original_perf = self.current_performance[current_provider].copy()
+                # Keep the original performance data; the loaded dict is shared
+                # with other readers, so it's replaced rather than modified
+                original_perf = self.current_performance[current_provider]
                 
                 # Degrade performance metrics
-                self.current_performance[current_provider].update({
-                    'average_response_time': 0.8,  # High response time
-                    'request_success_rate': 92,   # Lower success rate
-                    'cpu_utilization': 90,        # High CPU
-                    'memory_utilization': 85      # High memory
-                })
+                self.current_performance = {
+                    **self.current_performance,
+                    current_provider: {
+                        **original_perf,
+                        'average_response_time': 0.8,  # High response time
+                        'request_success_rate': 92,   # Lower success rate
+                        'cpu_utilization': 90,        # High CPU
+                        'memory_utilization': 85      # High memory
+                    }
+                }
                 
                 # Trigger failover check
                 result = self.check_and_failover()
                 
                 # Restore original performance data
-                self.current_performance[current_provider] = original_perf
+                self.current_performance = {**self.current_performance, current_provider: original_perf}
                 
                 return result
         
@@ -519,12 +563,12 @@ class AdvancedFailoverManager:
         
         return False
         
-    def get_recent_failover_events(self, limit=10):
+    def get_recent_failover_events(self, limit=10, session=None):
         """Get recent failover events from database"""
         try:
             # Use the database manager to get recent events
             from db_manager import db_manager
-            recent_events = db_manager.get_recent_failover_events(limit=limit)
+            recent_events = db_manager.get_recent_failover_events(limit=limit, session=session)
             return recent_events
         except Exception as e:
             logger.error(f"Error getting recent failover events: {str(e)}")
@@ -535,9 +579,8 @@ def get_active_provider():
     """Get the current active provider"""
     try:
         if os.path.exists(ACTIVE_PROVIDER_FILE):
-            with open(ACTIVE_PROVIDER_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('active_provider', DEFAULT_PROVIDER)
+            data = read_json_cached(ACTIVE_PROVIDER_FILE)
+            return data.get('active_provider', DEFAULT_PROVIDER)
         return DEFAULT_PROVIDER
     except Exception as e:
         logger.error(f"Failed to get active provider: {str(e)}")
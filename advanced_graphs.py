@@ -115,7 +115,7 @@ def create_availability_timeline():
             continue
             
         # Convert timestamps to datetime
-        timestamps = [datetime.fromisoformat(entry["timestamp"]) for entry in history]
+        timestamps = [datetime.fromtimestamp(entry["timestamp"]) for entry in history]
         
         # Create status values (1 for up, 0 for down)
         status_values = [1 if entry["status"] else 0 for entry in history]
@@ -322,7 +322,7 @@ def create_cost_trend_chart():
             continue
             
         # Convert timestamps to datetime
-        timestamps = [datetime.fromisoformat(entry["timestamp"]) for entry in history]
+        timestamps = [datetime.fromtimestamp(entry["timestamp"]) for entry in history]
         
         # Get total cost values
         cost_values = [entry.get("total_cost", 0) for entry in history]
@@ -1,13 +1,14 @@
-import json
 import logging
 import os
 import shutil
+import signal
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
 from config import CLOUD_STORAGE, BACKUP_SYNC_INTERVAL
+from json_files import read_json_cached, write_json_atomic
 
 # Setup logging
 logging.basicConfig(
@@ -101,15 +102,15 @@ class BackupSyncManager:
             logger.info(f"Sync completed. {files_synced} files synced out of {total_files} total files.")
             
             # Create a marker file with the sync timestamp
+            marker = {
+                'last_sync': datetime.now().isoformat(),
+                'files_synced': files_synced,
+                'total_files': total_files
+            }
             for provider, directory in self.cloud_storage.items():
                 marker_file = os.path.join(directory, ".sync_marker")
                 try:
-                    with open(marker_file, 'w') as f:
-                        json.dump({
-                            'last_sync': datetime.now().isoformat(),
-                            'files_synced': files_synced,
-                            'total_files': total_files
-                        }, f)
+                    write_json_atomic(marker_file, marker)
                 except Exception as e:
                     logger.error(f"Failed to create sync marker file for {provider}: {str(e)}")
             
@@ -146,8 +147,7 @@ class BackupSyncManager:
             
             if os.path.exists(marker_file):
                 try:
-                    with open(marker_file, 'r') as f:
-                        status[provider] = json.load(f)
+                    status[provider] = read_json_cached(marker_file)
                 except Exception as e:
                     logger.error(f"Failed to read sync marker file for {provider}: {str(e)}")
                     status[provider] = {
@@ -187,9 +187,8 @@ if __name__ == "__main__":
     # When run directly, start backup sync
     sync_manager = BackupSyncManager()
     sync_manager.start_backup_sync()
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Backup sync stopped")
+    # Keep main thread alive, blocked until Ctrl+C instead of polling
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    stop.wait()
+    print("Backup sync stopped")
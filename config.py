@@ -8,6 +8,10 @@ BASE_DIR = Path(__file__).resolve().parent
 
 # Health check configuration
 HEALTH_CHECK_INTERVAL = 30  # seconds
+# The interval doubles while every provider keeps its state, up to the max,
+# and drops to the min as soon as any provider changes state
+HEALTH_CHECK_MIN_INTERVAL = 10  # seconds
+HEALTH_CHECK_MAX_INTERVAL = 120  # seconds
 
 # Mock cloud endpoints to check health
 CLOUD_ENDPOINTS = {
@@ -25,6 +29,7 @@ AVAILABILITY_HISTORY_FILE = os.path.join(BASE_DIR, "data", "availability_history
 COST_HISTORY_FILE = os.path.join(BASE_DIR, "data", "cost_history.json")
 NETWORK_LATENCY_FILE = os.path.join(BASE_DIR, "data", "network_latency.json")
 FAILOVER_LOG_FILE = os.path.join(BASE_DIR, "logs", "failover.log")
+FIGURE_CACHE_DIR = os.path.join(BASE_DIR, "cache", "figures")
 
 # Mock cloud storage directories
 CLOUD_STORAGE = {
@@ -173,7 +178,7 @@ def generate_initial_availability_history():
                 status = False
                 
             history[provider].append({
-                "timestamp": timestamp.isoformat(),
+                "timestamp": int(timestamp.timestamp()),
                 "status": status,
                 "response_time": random.uniform(0.05, 0.5) if status else None
             })
@@ -193,7 +198,7 @@ def generate_initial_cost_history():
     
     for day_offset in range(30):
         # Calculate date safely by subtracting timedelta days
-        historical_date = now - timedelta(days=day_offset)
+        historical_date = (now - timedelta(days=day_offset)).replace(hour=0, minute=0, second=0, microsecond=0)
         
         for provider in providers:
             # Base cost per provider with some random variation
@@ -203,7 +208,7 @@ def generate_initial_cost_history():
             transfer_cost = provider_info["data_transfer_cost_gb"] * random.randint(10, 100)
             
             history[provider].append({
-                "timestamp": historical_date.isoformat(),
+                "timestamp": int(historical_date.timestamp()),
                 "compute_cost": round(compute_cost, 2),
                 "storage_cost": round(storage_cost, 2),
                 "transfer_cost": round(transfer_cost, 2),
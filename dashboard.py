@@ -5,7 +5,10 @@ import time
 import json
 from datetime import datetime, timedelta
 import random
+import glob
+import contextlib
 
+from config import COST_HISTORY_FILE, METRICS_FILE, FIGURE_CACHE_DIR
 from health_check import get_current_health_status
 from failover_manager import get_active_provider, FailoverManager
 from advanced_failover import advanced_failover_manager
@@ -19,27 +22,10 @@ from performance_monitor import (
     calculate_availability_percentage,
     get_total_cost_by_provider
 )
+from database import latest_cost_per_provider
+from json_files import write_text_atomic
 from disaster_recovery_dashboard import render_disaster_recovery_dashboard
 from metrics_table import get_formatted_metrics_table
-from graph_renderer import (
-    create_performance_bar_chart,
-    create_cost_bar_chart,
-    create_rto_rpo_scatter,
-    create_downtime_comparison_chart,
-    create_metrics_radar_chart
-)
-from advanced_graphs import (
-    create_performance_comparison_chart,
-    create_availability_timeline,
-    create_network_latency_chart,
-    create_cost_breakdown_chart,
-    create_cost_trend_chart,
-    create_availability_sla_gauge,
-    create_failover_timeline_chart,
-    create_reliability_comparison_chart,
-    create_realtime_performance_gauges,
-    create_rpo_rto_analysis_chart
-)
 
 # Color schemes for consistent visualizations
 PROVIDER_COLORS = {
@@ -48,6 +34,38 @@ PROVIDER_COLORS = {
     "gcp": "#4285F4"       # Google Blue
 }
 
+# Fixed category set for the display "Provider" column
+PROVIDER_DTYPE = pd.CategoricalDtype(categories=["AWS", "AZURE", "GCP"], ordered=True)
+
+def _disk_cached_fig(name, source_file, builder):
+    """Load a chart from the on-disk figure cache, rebuilding it when its source file changes"""
+    import plotly.io as pio
+    
+    try:
+        snapshot = os.stat(source_file).st_mtime_ns
+    except OSError:
+        return builder()
+    
+    cache_path = os.path.join(FIGURE_CACHE_DIR, f"{name}_{snapshot}.json")
+    try:
+        with open(cache_path, "r") as f:
+            return pio.from_json(f.read())
+    except FileNotFoundError:
+        pass
+    
+    fig = builder()
+    
+    # Replace any figure cached for an older snapshot of the same source;
+    # another session may be sweeping the same files concurrently
+    os.makedirs(FIGURE_CACHE_DIR, exist_ok=True)
+    for stale_path in glob.glob(os.path.join(FIGURE_CACHE_DIR, f"{name}_*.json")):
+        if stale_path != cache_path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(stale_path)
+    write_text_atomic(cache_path, pio.to_json(fig))
+    
+    return fig
+
 def render_dashboard():
     """Render the main dashboard"""
     st.set_page_config(
@@ -227,6 +245,13 @@ def render_dashboard():
 
 def render_overview_page():
     """Render the overview dashboard page"""
+    from advanced_graphs import (
+        create_availability_timeline,
+        create_failover_timeline_chart,
+        create_network_latency_chart,
+        create_realtime_performance_gauges
+    )
+    
     # Header
     st.title("Multi-Cloud Disaster Recovery Framework")
     st.markdown("### Real-time monitoring, automated failover, and business continuity")
@@ -379,6 +404,13 @@ def render_overview_page():
 
 def render_health_monitoring_page():
     """Render the health monitoring page"""
+    from advanced_graphs import (
+        create_availability_sla_gauge,
+        create_availability_timeline,
+        create_network_latency_chart,
+        create_performance_comparison_chart
+    )
+    
     st.title("Health Monitoring Dashboard")
     
     # Get health data
@@ -494,6 +526,12 @@ def render_health_monitoring_page():
 
 def render_failover_management_page():
     """Render the failover management page"""
+    from advanced_graphs import (
+        create_failover_timeline_chart,
+        create_reliability_comparison_chart,
+        create_rpo_rto_analysis_chart
+    )
+    
     st.title("Failover Management Dashboard")
     
     # Get active provider and health status
@@ -767,6 +805,18 @@ def render_storage_backup_page():
 
 def render_performance_analytics_page():
     """Render the performance analytics page"""
+    from graph_renderer import (
+        create_performance_bar_chart,
+        create_rto_rpo_scatter,
+        create_downtime_comparison_chart,
+        create_metrics_radar_chart
+    )
+    from advanced_graphs import (
+        create_performance_comparison_chart,
+        create_realtime_performance_gauges,
+        create_rpo_rto_analysis_chart
+    )
+    
     st.title("Performance Analytics Dashboard")
     
     # Performance metrics visualization
@@ -838,6 +888,7 @@ def render_performance_analytics_page():
             performance_rows.append(row)
         
         perf_df = pd.DataFrame(performance_rows)
+        perf_df["Provider"] = perf_df["Provider"].astype(PROVIDER_DTYPE)
         st.dataframe(perf_df, use_container_width=True)
     else:
         st.info("No performance data available")
@@ -856,8 +907,36 @@ def render_performance_analytics_page():
     metrics_df = get_formatted_metrics_table()
     st.dataframe(metrics_df, use_container_width=True)
 
+@st.cache_data
+def _cost_recommendations():
+    """Static cost saving recommendations as (title, description, savings, impact) tuples"""
+    # These would be real recommendations in a production system
+    return (
+        (
+            "Optimize Cross-Region Data Transfer",
+            "Reduce unnecessary data transfers between regions to minimize transfer costs.",
+            "$15-25 per month",
+            "Low"
+        ),
+        (
+            "Adjust RPO for Non-Critical Data",
+            "Increase RPO for non-critical data to reduce backup frequency and storage costs.",
+            "$30-50 per month",
+            "Medium"
+        ),
+        (
+            "Consolidate Multi-Cloud Storage",
+            "Optimize storage distribution across providers to leverage economies of scale.",
+            "$40-60 per month",
+            "Medium"
+        )
+    )
+
 def render_cost_analysis_page():
     """Render the cost analysis page"""
+    from graph_renderer import create_cost_bar_chart
+    from advanced_graphs import create_cost_breakdown_chart, create_cost_trend_chart
+    
     st.title("Cost Analysis Dashboard")
     
     # Cost summary
@@ -865,7 +944,6 @@ def render_cost_analysis_page():
     
     # Get cost data
     total_costs = get_total_cost_by_provider()
-    cost_history = get_cost_history()
     
     # Display total costs
     col1, col2, col3 = st.columns(3)
@@ -906,7 +984,7 @@ def render_cost_analysis_page():
     st.subheader("Cost Breakdown by Provider and Type")
     
     try:
-        st.plotly_chart(create_cost_breakdown_chart(), use_container_width=True)
+        st.plotly_chart(_disk_cached_fig("cost_breakdown", COST_HISTORY_FILE, create_cost_breakdown_chart), use_container_width=True)
     except Exception as e:
         st.error(f"Error displaying cost breakdown: {str(e)}")
     
@@ -914,7 +992,7 @@ def render_cost_analysis_page():
     st.subheader("Daily Cost Trend (Last 30 Days)")
     
     try:
-        st.plotly_chart(create_cost_trend_chart(), use_container_width=True)
+        st.plotly_chart(_disk_cached_fig("cost_trend", COST_HISTORY_FILE, create_cost_trend_chart), use_container_width=True)
     except Exception as e:
         st.error(f"Error displaying cost trend: {str(e)}")
     
@@ -922,40 +1000,20 @@ def render_cost_analysis_page():
     st.subheader("Cost by Failure Scenario")
     
     try:
-        st.plotly_chart(create_cost_bar_chart(), use_container_width=True)
+        st.plotly_chart(_disk_cached_fig("cost_by_scenario", METRICS_FILE, create_cost_bar_chart), use_container_width=True)
     except Exception as e:
         st.error(f"Error displaying cost by scenario: {str(e)}")
     
     # Cost saving recommendations
     st.subheader("Cost Saving Recommendations")
     
-    # These would be real recommendations in a production system
-    recommendations = [
-        {
-            "title": "Optimize Cross-Region Data Transfer",
-            "description": "Reduce unnecessary data transfers between regions to minimize transfer costs.",
-            "savings": "$15-25 per month",
-            "impact": "Low"
-        },
-        {
-            "title": "Adjust RPO for Non-Critical Data",
-            "description": "Increase RPO for non-critical data to reduce backup frequency and storage costs.",
-            "savings": "$30-50 per month",
-            "impact": "Medium"
-        },
-        {
-            "title": "Consolidate Multi-Cloud Storage",
-            "description": "Optimize storage distribution across providers to leverage economies of scale.",
-            "savings": "$40-60 per month",
-            "impact": "Medium"
-        }
-    ]
-    
-    for i, rec in enumerate(recommendations):
-        with st.expander(f"{i+1}. {rec['title']} (Est. Savings: {rec['savings']})"):
-            st.markdown(f"**Description:** {rec['description']}")
-            st.markdown(f"**Estimated Savings:** {rec['savings']}")
-            st.markdown(f"**Operational Impact:** {rec['impact']}")
+    for i, (title, description, savings, impact) in enumerate(_cost_recommendations()):
+        with st.expander(f"{i+1}. {title} (Est. Savings: {savings})"):
+            st.markdown(
+                f"**Description:** {description}\n\n"
+                f"**Estimated Savings:** {savings}\n\n"
+                f"**Operational Impact:** {impact}"
+            )
             
             # Implementation button (just for demo)
             st.button(f"Implement This Recommendation", key=f"rec_{i}")
@@ -963,32 +1021,29 @@ def render_cost_analysis_page():
     # Detailed cost data
     st.subheader("Detailed Cost Data")
     
-    if cost_history:
-        # Show latest cost data
-        cost_rows = []
-        
-        for provider, history in cost_history.items():
-            if history:
-                latest = history[-1]
-                
-                row = {
-                    "Provider": provider.upper(),
-                    "Compute Cost": f"${latest.get('compute_cost', 0):.2f}",
-                    "Storage Cost": f"${latest.get('storage_cost', 0):.2f}",
-                    "Transfer Cost": f"${latest.get('transfer_cost', 0):.2f}",
-                    "Total Cost": f"${latest.get('total_cost', 0):.2f}",
-                    "Date": datetime.fromisoformat(latest.get('timestamp')).strftime("%Y-%m-%d")
-                }
-                
-                cost_rows.append(row)
-        
-        if cost_rows:
-            cost_df = pd.DataFrame(cost_rows)
-            st.dataframe(cost_df, use_container_width=True)
-        else:
-            st.info("No detailed cost data available")
+    # Latest cost per provider straight from the database
+    latest_costs = latest_cost_per_provider()
+    
+    # Fall back to the tail of the cost history file if the database has no records
+    if latest_costs.empty:
+        cost_history = get_cost_history()
+        latest_costs = pd.DataFrame([
+            {**history[-1], "provider": provider, "record_date": datetime.fromtimestamp(history[-1]["timestamp"])}
+            for provider, history in cost_history.items() if history
+        ])
+    
+    if not latest_costs.empty:
+        cost_df = pd.DataFrame({
+            "Provider": latest_costs["provider"].str.upper().astype(PROVIDER_DTYPE),
+            "Compute Cost": latest_costs["compute_cost"].map("${:.2f}".format),
+            "Storage Cost": latest_costs["storage_cost"].map("${:.2f}".format),
+            "Transfer Cost": latest_costs["transfer_cost"].map("${:.2f}".format),
+            "Total Cost": latest_costs["total_cost"].map("${:.2f}".format),
+            "Date": pd.to_datetime(latest_costs["record_date"]).dt.strftime("%Y-%m-%d")
+        })
+        st.dataframe(cost_df, use_container_width=True)
     else:
-        st.info("No cost history data available")
+        st.info("No detailed cost data available")
 
 def render_configuration_page():
     """Render the configuration page"""
@@ -1101,14 +1156,18 @@ def render_configuration_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("**Framework Version:** 1.0")
-        st.markdown("**Python Version:** 3.11")
-        st.markdown("**Operating System:** Linux")
+        st.markdown("\n\n".join([
+            "**Framework Version:** 1.0",
+            "**Python Version:** 3.11",
+            "**Operating System:** Linux"
+        ]))
     
     with col2:
-        st.markdown("**Uptime:** 3 days, 12 hours")
-        st.markdown("**Last Restart:** 2025-05-15 08:30:00")
-        st.markdown("**Status:** Active")
+        st.markdown("\n\n".join([
+            "**Uptime:** 3 days, 12 hours",
+            "**Last Restart:** 2025-05-15 08:30:00",
+            "**Status:** Active"
+        ]))
     
     # System tools
     st.subheader("System Tools")
@@ -1127,9 +1186,10 @@ def render_configuration_page():
     
     with col3:
         if st.button("Verify Integrity"):
-            st.info("Verifying system integrity... (simulated)")
-            time.sleep(1)  # Simulate processing
-            st.success("System integrity verified!")
+            with st.spinner("Verifying system integrity... (simulated)"):
+                verified = True  # In production would run the actual integrity checks
+            if verified:
+                st.success("System integrity verified!")
 
 if __name__ == "__main__":
     render_dashboard()
@@ -1,20 +1,34 @@
+import atexit
 import os
 import logging
 import json
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey
+import pandas as pd
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Index, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 
-# Set up logging
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set up logging; records are formatted by the queue handler and written by
+# a background listener. This module is imported first, so its basicConfig
+# sets up the root logger that most other modules' loggers propagate to
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.FileHandler('logs/database.log'), logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/database.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger('database')
 
@@ -25,16 +39,45 @@ if not DATABASE_URL:
     DATABASE_URL = "sqlite:///multi_cloud_dr.db"  # Fallback to SQLite
     logger.warning(f"Using fallback SQLite database: {DATABASE_URL}")
 
+# Serialize JSON columns with orjson when it is installed
+if orjson is not None:
+    _json_options = {
+        "json_serializer": lambda obj: orjson.dumps(obj).decode(),
+        "json_deserializer": orjson.loads
+    }
+else:
+    _json_options = {}
+
 # Create engine and session
 try:
-    engine = create_engine(DATABASE_URL)
-    Session = sessionmaker(bind=engine)
+    # Reuse the most recently returned connection first (LIFO) so bursty
+    # dashboard loads keep a small set of warm connections
+    engine = create_engine(
+        DATABASE_URL,
+        pool_use_lifo=True,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        **_json_options
+    )
+    # Objects stay readable after the session that loaded them commits
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
     Base = declarative_base()
     logger.info("Database connection established")
 except Exception as e:
     logger.error(f"Error connecting to database: {str(e)}")
     raise
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so buffered writes don't fsync on every commit or block readers"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # Define models
 class CloudProvider(Base):
     """Model for cloud provider information"""
@@ -72,6 +115,11 @@ class HealthCheck(Base):
     status_code = Column(Integer, nullable=True)
     checked_at = Column(DateTime, default=datetime.now, index=True)
     
+    # Covers the availability window scan without touching the table
+    __table_args__ = (
+        Index('ix_health_checks_provider_checked_status', 'provider_id', 'checked_at', 'status'),
+    )
+    
     # Relationships
     provider = relationship("CloudProvider", back_populates="health_checks")
     
@@ -88,7 +136,7 @@ class FailoverEvent(Base):
     reason = Column(String(255))
     is_manual = Column(Boolean, default=False)
     triggered_by = Column(String(100), nullable=True)  # User or system
-    details = Column(Text, nullable=True)  # JSON string with additional details
+    details = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Additional details
     occurred_at = Column(DateTime, default=datetime.now, index=True)
     
     def __repr__(self):
@@ -108,6 +156,11 @@ class PerformanceMetric(Base):
     average_response_time = Column(Float)
     recorded_at = Column(DateTime, default=datetime.now, index=True)
     
+    # Serves the latest-metrics-per-provider lookup
+    __table_args__ = (
+        Index('ix_performance_metrics_provider_recorded', 'provider_id', 'recorded_at'),
+    )
+    
     # Relationships
     provider = relationship("CloudProvider", back_populates="performance_metrics")
     
@@ -144,6 +197,11 @@ class CostRecord(Base):
     record_date = Column(DateTime, index=True)
     created_at = Column(DateTime, default=datetime.now)
     
+    # One row per provider per day; cost writes upsert against this
+    __table_args__ = (
+        Index('ux_cost_records_provider_date', 'provider', 'record_date', unique=True),
+    )
+    
     def __repr__(self):
         return f"<CostRecord(provider='{self.provider}', total_cost={self.total_cost})>"
 
@@ -166,15 +224,38 @@ class RecoveryMetric(Base):
     def __repr__(self):
         return f"<RecoveryMetric(scenario='{self.scenario}')>"
 
+# Set once init_db has run so repeated imports/reruns skip the catalog probes
+_initialized = False
+
+# Arbitrary key shared by all workers to serialize schema creation on Postgres
+_INIT_LOCK_KEY = 12345
+
 # Create all tables
+def _create_missing_indexes(conn):
+    """Add indexes declared after a table was first created"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 def init_db():
-    """Initialize the database tables"""
+    """Initialize the database tables (only once per process)"""
+    global _initialized
+    if _initialized:
+        return
+    
     try:
-        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                # Serialize create_all across workers starting at the same time;
+                # the lock is released when this transaction commits or rolls back
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _INIT_LOCK_KEY})
+            Base.metadata.create_all(conn)
+            _create_missing_indexes(conn)
         logger.info("Database tables created successfully")
         
         # Initialize with default data
         init_default_data()
+        _initialized = True
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         raise
@@ -294,6 +375,27 @@ def init_default_data():
     finally:
         session.close()
 
+# Most recent cost record per provider, ranked server-side
+LATEST_COST_QUERY = text("""
+    SELECT provider, compute_cost, storage_cost, transfer_cost, total_cost, record_date
+    FROM (
+        SELECT provider, compute_cost, storage_cost, transfer_cost, total_cost, record_date,
+               ROW_NUMBER() OVER (PARTITION BY provider ORDER BY record_date DESC) AS rn
+        FROM cost_records
+    ) ranked
+    WHERE rn = 1
+    ORDER BY provider
+""")
+
+def latest_cost_per_provider():
+    """Get the latest cost record for each provider as a DataFrame"""
+    try:
+        with engine.connect() as conn:
+            return pd.read_sql_query(LATEST_COST_QUERY, conn)
+    except Exception as e:
+        logger.error(f"Error getting latest cost per provider: {str(e)}")
+        return pd.DataFrame()
+
 # Function to get a database session
 def get_db_session():
     """Get a database session"""
@@ -1,6 +1,23 @@
+import atexit
+import functools
 import logging
 import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 
 from database import (
     get_db_session, 
@@ -14,20 +31,59 @@ from database import (
     init_db
 )
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/db_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging; records are queued and written by a background listener
+# so file I/O stays off the database write path
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    RotatingFileHandler('logs/db_manager.log', maxBytes=10 * 1024 * 1024, backupCount=3),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger('db_manager')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _ttl_cached(seconds):
+    """Memoize a DatabaseManager read method for a few seconds"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # A borrowed session doesn't change the result
+            key = (method.__name__, args, tuple(sorted(
+                (name, value) for name, value in kwargs.items() if name != "session"
+            )))
+            now = time.monotonic()
+            
+            cached = self._cache.get(key)
+            if cached is not None and now - cached[0] < seconds:
+                return cached[1]
+            
+            result = method(self, *args, **kwargs)
+            self._cache[key] = (now, result)
+            return result
+        return wrapper
+    return decorator
 
 class DatabaseManager:
     """Manager class for database operations"""
     
+    # Buffered telemetry rows are flushed every FLUSH_INTERVAL seconds
+    # or as soon as FLUSH_BATCH_SIZE rows are waiting
+    FLUSH_INTERVAL = 1.0  # seconds
+    FLUSH_BATCH_SIZE = 500
+    # Rows kept per table for retry while the database is unreachable
+    MAX_BUFFERED_ROWS = 10 * FLUSH_BATCH_SIZE
+    
     def __init__(self):
         """Initialize the database manager"""
         # Ensure database tables are created
@@ -35,147 +91,253 @@ class DatabaseManager:
             init_db()
         except Exception as e:
             logger.error(f"Failed to initialize database: {str(e)}")
+        
+        # Short-lived results of hot read methods, see _ttl_cached
+        self._cache = {}
+        
+        # Provider ids by name and names by id; the provider set is seeded
+        # once and never changes
+        self._provider_ids = {}
+        self._provider_names = None
+        
+        # Recovery metrics, loaded on first use, see get_recovery_metrics
+        self._recovery_metrics = None
+        
+        # Write buffers for high-frequency telemetry, keyed by model
+        self._buffer_lock = threading.Lock()
+        self._write_buffers = {HealthCheck: [], PerformanceMetric: [], CostRecord: []}
+        self._flush_event = threading.Event()
+        
+        flush_thread = threading.Thread(target=self._run_flush_thread, daemon=True)
+        flush_thread.start()
+        atexit.register(self.flush)
     
-    def get_provider_by_name(self, provider_name):
-        """Get a cloud provider by name"""
+    @contextmanager
+    def session_scope(self, session=None):
+        """Yield a session for a unit of work, reusing the caller's if given"""
+        if session is not None:
+            # The caller owns this session and its transaction
+            yield session
+            return
+        
         session = get_db_session()
         try:
-            provider = session.query(CloudProvider).filter_by(name=provider_name).first()
-            return provider
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def _enqueue(self, model, row):
+        """Buffer a row for the next bulk insert"""
+        with self._buffer_lock:
+            buffer = self._write_buffers[model]
+            buffer.append(row)
+            if len(buffer) >= self.FLUSH_BATCH_SIZE:
+                self._flush_event.set()
+    
+    def _run_flush_thread(self):
+        """Flush buffered rows periodically or when a buffer fills up"""
+        while True:
+            self._flush_event.wait(self.FLUSH_INTERVAL)
+            self._flush_event.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write buffered rows, one transaction per table"""
+        with self._buffer_lock:
+            drained = {model: rows for model, rows in self._write_buffers.items() if rows}
+            self._write_buffers = {model: [] for model in self._write_buffers}
+        
+        if not drained:
+            return True
+        
+        # Core executemany inserts, skipping the ORM unit of work; a failing
+        # table doesn't discard the batches of the others
+        failed = {}
+        for model, rows in drained.items():
+            try:
+                with self.session_scope() as session:
+                    if model is CostRecord:
+                        self._upsert_costs(session, rows)
+                    else:
+                        session.execute(model.__table__.insert(), rows)
+            except Exception as e:
+                logger.error(f"Error flushing buffered {model.__tablename__} rows: {str(e)}")
+                failed[model] = rows
+        
+        if len(failed) < len(drained):
+            self._cache.clear()
+        
+        if failed:
+            self._requeue(failed)
+            return False
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Flushed %d buffered rows", sum(len(rows) for rows in drained.values()))
+        return True
+    
+    def _requeue(self, failed):
+        """Put rows that failed to flush back ahead of newer ones for the next attempt"""
+        with self._buffer_lock:
+            for model, rows in failed.items():
+                buffer = rows + self._write_buffers[model]
+                overflow = len(buffer) - self.MAX_BUFFERED_ROWS
+                if overflow > 0:
+                    # Drop the oldest rows rather than grow without bound
+                    logger.error(f"Dropping {overflow} buffered {model.__tablename__} rows after repeated flush failures")
+                    buffer = buffer[overflow:]
+                self._write_buffers[model] = buffer
+    
+    def _upsert_costs(self, session, rows):
+        """Insert cost rows, overwriting any existing row for the same provider and day"""
+        # A statement may only touch each key once, so keep the last entry per key
+        rows = list({(row["provider"], row["record_date"]): row for row in rows}.values())
+        
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(CostRecord.__table__)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(CostRecord.__table__)
+        else:
+            session.execute(CostRecord.__table__.insert(), rows)
+            return
+        
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["provider", "record_date"],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("compute_cost", "storage_cost", "transfer_cost", "total_cost")
+            }
+        )
+        session.execute(stmt, rows)
+    
+    def get_provider_by_name(self, provider_name, session=None):
+        """Get a cloud provider by name"""
+        try:
+            with self.session_scope(session) as session:
+                provider = session.scalars(
+                    select(CloudProvider).where(CloudProvider.name == provider_name)
+                ).first()
+                return provider
         except Exception as e:
             logger.error(f"Error getting provider by name: {str(e)}")
             return None
-        finally:
-            session.close()
     
-    def record_health_check(self, provider_name, status, response_time=None, error_message=None, status_code=None):
-        """Record a health check result"""
-        session = get_db_session()
+    def _get_provider_id(self, provider_name, session=None):
+        """Get a provider's id, loading it from the database on first use"""
+        provider_id = self._provider_ids.get(provider_name)
+        if provider_id is None:
+            provider = self.get_provider_by_name(provider_name, session=session)
+            if provider:
+                provider_id = self._provider_ids[provider_name] = provider.id
+        return provider_id
+    
+    def _get_provider_names(self, session):
+        """Map provider ids to names, loading the provider table once"""
+        if self._provider_names is None:
+            providers = session.execute(select(CloudProvider.id, CloudProvider.name)).all()
+            self._provider_ids.update({name: provider_id for provider_id, name in providers})
+            self._provider_names = {provider_id: name for provider_id, name in providers}
+        return self._provider_names
+    
+    def record_health_check(self, provider_name, status, response_time=None, error_message=None, status_code=None, session=None):
+        """Buffer a health check result for the next bulk insert"""
         try:
-            # Get provider
-            provider = self.get_provider_by_name(provider_name)
-            if not provider:
+            # Get provider id
+            provider_id = self._get_provider_id(provider_name, session=session)
+            if provider_id is None:
                 logger.warning(f"Provider {provider_name} not found in database")
                 return False
             
-            # Create health check record
-            health_check = HealthCheck(
-                provider_id=provider.id,
-                status=status,
-                response_time=response_time,
-                error_message=error_message,
-                status_code=status_code,
-                checked_at=datetime.now()
-            )
-            
-            session.add(health_check)
-            session.commit()
-            logger.debug(f"Health check recorded for {provider_name}: {status}")
+            self._enqueue(HealthCheck, {
+                "provider_id": provider_id,
+                "status": status,
+                "response_time": response_time,
+                "error_message": error_message,
+                "status_code": status_code,
+                "checked_at": datetime.now()
+            })
+            logger.debug("Health check recorded for %s: %s", provider_name, status)
             return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error recording health check: {str(e)}")
             return False
-        
-        finally:
-            session.close()
     
-    def record_failover_event(self, from_provider, to_provider, reason=None, is_manual=False, triggered_by=None, details=None):
+    def record_failover_event(self, from_provider, to_provider, reason=None, is_manual=False, triggered_by=None, details=None, session=None):
         """Record a failover event"""
-        session = get_db_session()
         try:
-            # Create failover event record
-            failover_event = FailoverEvent(
-                from_provider=from_provider,
-                to_provider=to_provider,
-                reason=reason,
-                is_manual=is_manual,
-                triggered_by=triggered_by,
-                details=json.dumps(details) if details else None,
-                occurred_at=datetime.now()
-            )
-            
-            session.add(failover_event)
-            session.commit()
-            logger.info(f"Failover event recorded: {from_provider} → {to_provider}")
+            with self.session_scope(session) as session:
+                # Insert the failover event row directly, no ORM object needed
+                session.execute(FailoverEvent.__table__.insert().values(
+                    from_provider=from_provider,
+                    to_provider=to_provider,
+                    reason=reason,
+                    is_manual=is_manual,
+                    triggered_by=triggered_by,
+                    details=details or None
+                ))
+                logger.info(f"Failover event recorded: {from_provider} → {to_provider}")
+            # Cached event lists no longer include the newest event
+            self._cache.clear()
             return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error recording failover event: {str(e)}")
             return False
-        
-        finally:
-            session.close()
     
-    def record_performance_metrics(self, provider_name, metrics):
-        """Record performance metrics"""
-        session = get_db_session()
+    def record_performance_metrics(self, provider_name, metrics, session=None):
+        """Buffer performance metrics for the next bulk insert"""
         try:
-            # Get provider
-            provider = self.get_provider_by_name(provider_name)
-            if not provider:
+            # Get provider id
+            provider_id = self._get_provider_id(provider_name, session=session)
+            if provider_id is None:
                 logger.warning(f"Provider {provider_name} not found in database")
                 return False
             
-            # Create performance metrics record
-            perf_metrics = PerformanceMetric(
-                provider_id=provider.id,
-                cpu_utilization=metrics.get('cpu_utilization', 0),
-                memory_utilization=metrics.get('memory_utilization', 0),
-                disk_iops=metrics.get('disk_iops', 0),
-                network_throughput=metrics.get('network_throughput', 0),
-                request_success_rate=metrics.get('request_success_rate', 0),
-                average_response_time=metrics.get('average_response_time', 0),
-                recorded_at=datetime.now()
-            )
-            
-            session.add(perf_metrics)
-            session.commit()
-            logger.debug(f"Performance metrics recorded for {provider_name}")
+            self._enqueue(PerformanceMetric, {
+                "provider_id": provider_id,
+                "cpu_utilization": metrics.get('cpu_utilization', 0),
+                "memory_utilization": metrics.get('memory_utilization', 0),
+                "disk_iops": metrics.get('disk_iops', 0),
+                "network_throughput": metrics.get('network_throughput', 0),
+                "request_success_rate": metrics.get('request_success_rate', 0),
+                "average_response_time": metrics.get('average_response_time', 0),
+                "recorded_at": datetime.now()
+            })
+            logger.debug("Performance metrics recorded for %s", provider_name)
             return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error recording performance metrics: {str(e)}")
             return False
-        
-        finally:
-            session.close()
     
-    def record_backup_sync(self, source_provider, target_provider, files_synced, total_files, success=True, error_message=None, sync_duration=0):
+    def record_backup_sync(self, source_provider, target_provider, files_synced, total_files, success=True, error_message=None, sync_duration=0, session=None):
         """Record a backup sync event"""
-        session = get_db_session()
         try:
-            # Create backup sync record
-            backup_sync = BackupSync(
-                source_provider=source_provider,
-                target_provider=target_provider,
-                files_synced=files_synced,
-                total_files=total_files,
-                success=success,
-                error_message=error_message,
-                sync_duration=sync_duration,
-                completed_at=datetime.now()
-            )
-            
-            session.add(backup_sync)
-            session.commit()
-            logger.debug(f"Backup sync recorded: {source_provider} → {target_provider}")
-            return True
+            with self.session_scope(session) as session:
+                # Insert the backup sync row directly, no ORM object needed
+                session.execute(BackupSync.__table__.insert().values(
+                    source_provider=source_provider,
+                    target_provider=target_provider,
+                    files_synced=files_synced,
+                    total_files=total_files,
+                    success=success,
+                    error_message=error_message,
+                    sync_duration=sync_duration
+                ))
+                logger.debug("Backup sync recorded: %s → %s", source_provider, target_provider)
+                return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error recording backup sync: {str(e)}")
             return False
-        
-        finally:
-            session.close()
     
     def record_cost(self, provider, compute_cost, storage_cost, transfer_cost, record_date=None):
-        """Record a cost entry"""
-        session = get_db_session()
+        """Buffer a cost entry for the next bulk upsert"""
         try:
             # Calculate total cost
             total_cost = compute_cost + storage_cost + transfer_cost
@@ -184,285 +346,287 @@ class DatabaseManager:
             if not record_date:
                 record_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             
-            # Create cost record
-            cost_record = CostRecord(
-                provider=provider,
-                compute_cost=compute_cost,
-                storage_cost=storage_cost,
-                transfer_cost=transfer_cost,
-                total_cost=total_cost,
-                record_date=record_date
-            )
-            
-            session.add(cost_record)
-            session.commit()
-            logger.debug(f"Cost record added for {provider}: ${total_cost:.2f}")
+            self._enqueue(CostRecord, {
+                "provider": provider,
+                "compute_cost": compute_cost,
+                "storage_cost": storage_cost,
+                "transfer_cost": transfer_cost,
+                "total_cost": total_cost,
+                "record_date": record_date
+            })
+            logger.debug("Cost record added for %s: $%.2f", provider, total_cost)
             return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error recording cost: {str(e)}")
             return False
-        
-        finally:
-            session.close()
     
-    def get_health_status(self):
+    @_ttl_cached(seconds=2)
+    def get_health_status(self, session=None):
         """Get the latest health status for all providers"""
-        session = get_db_session()
         try:
-            # Get all providers
-            providers = session.query(CloudProvider).all()
-            result = {}
-            
-            for provider in providers:
-                # Get latest health check for this provider
-                latest_check = session.query(HealthCheck) \
-                    .filter_by(provider_id=provider.id) \
-                    .order_by(HealthCheck.checked_at.desc()) \
-                    .first()
+            with self.session_scope(session) as session:
+                # Rank each provider's checks newest-first and keep the top one
+                ranked = select(
+                    HealthCheck.provider_id,
+                    HealthCheck.status,
+                    HealthCheck.checked_at,
+                    HealthCheck.response_time,
+                    HealthCheck.error_message,
+                    HealthCheck.status_code,
+                    func.row_number().over(
+                        partition_by=HealthCheck.provider_id,
+                        order_by=HealthCheck.checked_at.desc()
+                    ).label("rn")
+                ).subquery()
                 
-                if latest_check:
-                    result[provider.name] = {
-                        "status": latest_check.status,
-                        "last_checked": latest_check.checked_at.isoformat(),
-                        "response_time": latest_check.response_time
-                    }
-                    
-                    # Add error details if available
-                    if not latest_check.status:
-                        if latest_check.error_message:
-                            result[provider.name]["error"] = latest_check.error_message
-                        if latest_check.status_code:
-                            result[provider.name]["status_code"] = latest_check.status_code
-            
-            return result
+                rows = session.execute(select(ranked).where(ranked.c.rn == 1)).all()
+                provider_names = self._get_provider_names(session)
+                
+                result = {}
+                for latest_check in rows:
+                    provider_name = provider_names.get(latest_check.provider_id)
+                    if provider_name:
+                        result[provider_name] = {
+                            "status": latest_check.status,
+                            "last_checked": latest_check.checked_at.isoformat(),
+                            "response_time": latest_check.response_time
+                        }
+                        
+                        # Add error details if available
+                        if not latest_check.status:
+                            if latest_check.error_message:
+                                result[provider_name]["error"] = latest_check.error_message
+                            if latest_check.status_code:
+                                result[provider_name]["status_code"] = latest_check.status_code
+                
+                return result
         
         except Exception as e:
             logger.error(f"Error getting health status: {str(e)}")
             return {}
-        
-        finally:
-            session.close()
     
-    def get_recent_failover_events(self, limit=10):
+    @_ttl_cached(seconds=2)
+    def get_recent_failover_events(self, limit=10, session=None):
         """Get recent failover events"""
-        session = get_db_session()
         try:
-            # Get recent failover events
-            events = session.query(FailoverEvent) \
-                .order_by(FailoverEvent.occurred_at.desc()) \
-                .limit(limit) \
-                .all()
-            
-            result = []
-            for event in events:
-                event_data = {
-                    "id": event.id,
-                    "from_provider": event.from_provider,
-                    "to_provider": event.to_provider,
-                    "reason": event.reason,
-                    "is_manual": event.is_manual,
-                    "triggered_by": event.triggered_by,
-                    "occurred_at": event.occurred_at.isoformat()
-                }
+            with self.session_scope(session) as session:
+                # Get recent failover events
+                events = session.execute(
+                    select(
+                        FailoverEvent.id,
+                        FailoverEvent.from_provider,
+                        FailoverEvent.to_provider,
+                        FailoverEvent.reason,
+                        FailoverEvent.is_manual,
+                        FailoverEvent.triggered_by,
+                        FailoverEvent.details,
+                        FailoverEvent.occurred_at
+                    )
+                    .order_by(FailoverEvent.occurred_at.desc())
+                    .limit(limit)
+                ).all()
                 
-                # Parse details JSON if available
-                if event.details:
-                    try:
-                        event_data["details"] = json.loads(event.details)
-                    except:
-                        event_data["details"] = event.details
+                result = []
+                for event in events:
+                    event_data = {
+                        "id": event.id,
+                        "from_provider": event.from_provider,
+                        "to_provider": event.to_provider,
+                        "reason": event.reason,
+                        "is_manual": event.is_manual,
+                        "triggered_by": event.triggered_by,
+                        "occurred_at": event.occurred_at.isoformat()
+                    }
+                    
+                    # Rows written before details became a JSON column hold a string
+                    details = event.details
+                    if isinstance(details, str):
+                        try:
+                            details = _json_loads(details)
+                        except ValueError:
+                            pass
+                    if details:
+                        event_data["details"] = details
+                    
+                    result.append(event_data)
                 
-                result.append(event_data)
-            
-            return result
+                return result
         
         except Exception as e:
             logger.error(f"Error getting failover events: {str(e)}")
             return []
-        
-        finally:
-            session.close()
     
-    def get_performance_data(self):
+    @_ttl_cached(seconds=2)
+    def get_performance_data(self, session=None):
         """Get the latest performance data for all providers"""
-        session = get_db_session()
         try:
-            # Get all providers
-            providers = session.query(CloudProvider).all()
-            result = {}
-            
-            for provider in providers:
-                # Get latest performance metrics for this provider
-                latest_metrics = session.query(PerformanceMetric) \
-                    .filter_by(provider_id=provider.id) \
-                    .order_by(PerformanceMetric.recorded_at.desc()) \
-                    .first()
+            with self.session_scope(session) as session:
+                # Rank each provider's metrics newest-first and keep the top one
+                ranked = select(
+                    PerformanceMetric.provider_id,
+                    PerformanceMetric.cpu_utilization,
+                    PerformanceMetric.memory_utilization,
+                    PerformanceMetric.disk_iops,
+                    PerformanceMetric.network_throughput,
+                    PerformanceMetric.request_success_rate,
+                    PerformanceMetric.average_response_time,
+                    PerformanceMetric.recorded_at,
+                    func.row_number().over(
+                        partition_by=PerformanceMetric.provider_id,
+                        order_by=PerformanceMetric.recorded_at.desc()
+                    ).label("rn")
+                ).subquery()
                 
-                if latest_metrics:
-                    result[provider.name] = {
-                        "cpu_utilization": latest_metrics.cpu_utilization,
-                        "memory_utilization": latest_metrics.memory_utilization,
-                        "disk_iops": latest_metrics.disk_iops,
-                        "network_throughput": latest_metrics.network_throughput,
-                        "request_success_rate": latest_metrics.request_success_rate,
-                        "average_response_time": latest_metrics.average_response_time,
-                        "timestamp": latest_metrics.recorded_at.isoformat()
-                    }
-            
-            return result
+                rows = session.execute(select(ranked).where(ranked.c.rn == 1)).all()
+                provider_names = self._get_provider_names(session)
+                
+                result = {}
+                for latest_metrics in rows:
+                    provider_name = provider_names.get(latest_metrics.provider_id)
+                    if provider_name:
+                        result[provider_name] = {
+                            "cpu_utilization": latest_metrics.cpu_utilization,
+                            "memory_utilization": latest_metrics.memory_utilization,
+                            "disk_iops": latest_metrics.disk_iops,
+                            "network_throughput": latest_metrics.network_throughput,
+                            "request_success_rate": latest_metrics.request_success_rate,
+                            "average_response_time": latest_metrics.average_response_time,
+                            "timestamp": latest_metrics.recorded_at.isoformat()
+                        }
+                
+                return result
         
         except Exception as e:
             logger.error(f"Error getting performance data: {str(e)}")
             return {}
-        
-        finally:
-            session.close()
     
-    def get_provider_availability(self, provider_name, hours=24):
+    def get_provider_availability(self, provider_name, hours=24, session=None):
         """Get availability percentage for a provider over a time period"""
-        session = get_db_session()
         try:
-            # Get provider
-            provider = self.get_provider_by_name(provider_name)
-            if not provider:
-                logger.warning(f"Provider {provider_name} not found in database")
-                return 0
-            
-            # Calculate time period
-            end_time = datetime.now()
-            start_time = end_time - timedelta(hours=hours)
-            
-            # Count total checks and successful checks
-            total_checks = session.query(HealthCheck) \
-                .filter(
-                    HealthCheck.provider_id == provider.id,
-                    HealthCheck.checked_at >= start_time,
-                    HealthCheck.checked_at <= end_time
-                ) \
-                .count()
-            
-            successful_checks = session.query(HealthCheck) \
-                .filter(
-                    HealthCheck.provider_id == provider.id,
-                    HealthCheck.checked_at >= start_time,
-                    HealthCheck.checked_at <= end_time,
-                    HealthCheck.status == True
-                ) \
-                .count()
-            
-            # Calculate availability percentage
-            if total_checks > 0:
-                availability = (successful_checks / total_checks) * 100
-            else:
-                availability = 0
-            
-            return availability
+            with self.session_scope(session) as session:
+                # Get provider id
+                provider_id = self._get_provider_id(provider_name, session=session)
+                if provider_id is None:
+                    logger.warning(f"Provider {provider_name} not found in database")
+                    return 0
+                
+                # Calculate time period
+                end_time = datetime.now()
+                start_time = end_time - timedelta(hours=hours)
+                
+                # Count total and successful checks in a single pass
+                total_checks, successful_checks = session.execute(
+                    select(
+                        func.count(HealthCheck.id),
+                        func.sum(case((HealthCheck.status == True, 1), else_=0))
+                    ).where(
+                        HealthCheck.provider_id == provider_id,
+                        HealthCheck.checked_at.between(start_time, end_time)
+                    )
+                ).one()
+                
+                # Calculate availability percentage
+                if total_checks > 0:
+                    availability = (successful_checks / total_checks) * 100
+                else:
+                    availability = 0
+                
+                return availability
         
         except Exception as e:
             logger.error(f"Error calculating availability: {str(e)}")
             return 0
-        
-        finally:
-            session.close()
     
-    def get_cost_history(self, provider=None, days=30):
+    def get_cost_history(self, provider=None, days=30, session=None):
         """Get cost history for a provider or all providers"""
-        session = get_db_session()
         try:
-            # Calculate time period
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            # Query cost records
-            query = session.query(CostRecord) \
-                .filter(CostRecord.record_date >= start_date) \
-                .order_by(CostRecord.record_date)
-            
-            # Filter by provider if specified
-            if provider:
-                query = query.filter(CostRecord.provider == provider)
-            
-            records = query.all()
-            
-            # Organize data by provider
-            result = {}
-            for record in records:
-                if record.provider not in result:
-                    result[record.provider] = []
+            with self.session_scope(session) as session:
+                # Calculate time period
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=days)
+                
+                # Query cost records straight into a DataFrame
+                query = select(
+                    CostRecord.provider,
+                    CostRecord.record_date,
+                    CostRecord.compute_cost,
+                    CostRecord.storage_cost,
+                    CostRecord.transfer_cost,
+                    CostRecord.total_cost
+                ).where(CostRecord.record_date >= start_date) \
+                    .order_by(CostRecord.record_date)
                 
-                result[record.provider].append({
-                    "timestamp": record.record_date.isoformat(),
-                    "compute_cost": record.compute_cost,
-                    "storage_cost": record.storage_cost,
-                    "transfer_cost": record.transfer_cost,
-                    "total_cost": record.total_cost
-                })
+                # Filter by provider if specified
+                if provider:
+                    query = query.where(CostRecord.provider == provider)
+                
+                df = pd.read_sql(query, session.connection())
             
-            return result
+            # Organize data by provider
+            df["timestamp"] = pd.to_datetime(df.pop("record_date")).dt.strftime("%Y-%m-%dT%H:%M:%S")
+            return {
+                provider_name: group.drop(columns="provider").to_dict("records")
+                for provider_name, group in df.groupby("provider", sort=False)
+            }
         
         except Exception as e:
             logger.error(f"Error getting cost history: {str(e)}")
             return {}
-        
-        finally:
-            session.close()
     
-    def get_recovery_metrics(self):
+    def get_recovery_metrics(self, session=None):
         """Get all recovery metrics"""
-        session = get_db_session()
+        # Reference data that only changes through update_recovery_metric
+        if self._recovery_metrics is not None:
+            return self._recovery_metrics
+        
         try:
-            metrics = session.query(RecoveryMetric).all()
-            result = {}
+            with self.session_scope(session) as session:
+                query = select(
+                    RecoveryMetric.scenario,
+                    RecoveryMetric.downtime.label("Downtime"),
+                    RecoveryMetric.rto.label("RTO"),
+                    RecoveryMetric.rpo.label("RPO"),
+                    RecoveryMetric.failover_time.label("Failover Time"),
+                    RecoveryMetric.cost.label("Cost"),
+                    RecoveryMetric.data_loss_probability.label("Data Loss Probability"),
+                    RecoveryMetric.reliability_score.label("Reliability Score")
+                )
+                df = pd.read_sql(query, session.connection())
             
-            for metric in metrics:
-                result[metric.scenario] = {
-                    "Downtime": metric.downtime,
-                    "RTO": metric.rto,
-                    "RPO": metric.rpo,
-                    "Failover Time": metric.failover_time,
-                    "Cost": metric.cost,
-                    "Data Loss Probability": metric.data_loss_probability,
-                    "Reliability Score": metric.reliability_score
-                }
-            
-            return result
+            self._recovery_metrics = df.set_index("scenario").to_dict("index")
+            return self._recovery_metrics
         
         except Exception as e:
             logger.error(f"Error getting recovery metrics: {str(e)}")
             return {}
-        
-        finally:
-            session.close()
     
-    def update_recovery_metric(self, scenario, metric_name, value):
+    def update_recovery_metric(self, scenario, metric_name, value, session=None):
         """Update a specific recovery metric"""
-        session = get_db_session()
         try:
-            # Find the metric
-            metric = session.query(RecoveryMetric).filter_by(scenario=scenario).first()
-            if not metric:
-                logger.warning(f"Recovery metric for scenario '{scenario}' not found")
-                return False
-            
-            # Update the specified metric
-            if hasattr(metric, metric_name.lower()):
+            with self.session_scope(session) as session:
+                # Find the metric
+                metric = session.scalars(
+                    select(RecoveryMetric).where(RecoveryMetric.scenario == scenario)
+                ).first()
+                if not metric:
+                    logger.warning(f"Recovery metric for scenario '{scenario}' not found")
+                    return False
+                
+                # Update the specified metric
+                if not hasattr(metric, metric_name.lower()):
+                    logger.warning(f"Invalid metric name: {metric_name}")
+                    return False
                 setattr(metric, metric_name.lower(), value)
-                session.commit()
-                logger.info(f"Updated {metric_name} for {scenario} to {value}")
-                return True
-            else:
-                logger.warning(f"Invalid metric name: {metric_name}")
-                return False
+            
+            # Reload recovery metrics once the change is committed
+            self._recovery_metrics = None
+            logger.info(f"Updated {metric_name} for {scenario} to {value}")
+            return True
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error updating recovery metric: {str(e)}")
             return False
-        
-        finally:
-            session.close()
 
 # Singleton instance
 db_manager = DatabaseManager()
@@ -479,6 +643,7 @@ if __name__ == "__main__":
     
     # Test recording health check
     db_manager.record_health_check("aws", True, 0.125)
+    db_manager.flush()
     
     # Test getting health status
     health_status = db_manager.get_health_status()
@@ -8,7 +8,6 @@ from datetime import datetime
 from health_check import get_current_health_status
 from failover_manager import get_active_provider
 from advanced_failover import advanced_failover_manager
-from performance_monitor import get_performance_data
 from db_manager import db_manager
 
 # Color schemes for providers
@@ -18,13 +17,36 @@ PROVIDER_COLORS = {
     "gcp": "#4285F4"       # Google Blue
 }
 
+# Read-only fetches are cached briefly so widget-driven reruns don't hit the
+# database; a leading underscore keeps the session out of the cache key
+@st.cache_data(ttl=2)
+def _cached_health_status(_session=None):
+    return get_current_health_status(session=_session)
+
+@st.cache_data(ttl=2)
+def _cached_recent_failover_events(limit=10, _session=None):
+    return advanced_failover_manager.get_recent_failover_events(limit=limit, session=_session)
+
+@st.cache_data(ttl=2)
+def _cached_recovery_metrics(_session=None):
+    return db_manager.get_recovery_metrics(session=_session)
+
+def _clear_cached_reads():
+    """Drop cached fetches after an action that changes them"""
+    _cached_health_status.clear()
+    _cached_recent_failover_events.clear()
+    _cached_recovery_metrics.clear()
+
 def render_disaster_recovery_dashboard():
     """Render the advanced disaster recovery dashboard page"""
     st.title("Disaster Recovery Management")
     st.markdown("### Advanced Failover Decision Engine and Disaster Simulation")
     
-    # Get current status
-    health_status = get_current_health_status()
+    # Get current status, sharing one database session across the page's reads
+    with db_manager.session_scope() as session:
+        health_status = _cached_health_status(_session=session)
+        recent_events = _cached_recent_failover_events(limit=10, _session=session)
+        recovery_metrics = _cached_recovery_metrics(_session=session)
     active_provider = get_active_provider()
     
     # Left column: Status and Controls
@@ -93,6 +115,7 @@ def render_disaster_recovery_dashboard():
                     
                     if success:
                         st.success(f"Successfully failed over from {active_provider.upper()} to {manual_target.upper()}")
+                        _clear_cached_reads()
                         time.sleep(0.5)
                         st.rerun()
                     else:
@@ -123,6 +146,7 @@ def render_disaster_recovery_dashboard():
                 
                 if result:
                     st.success(f"Disaster scenario triggered automatic failover")
+                    _clear_cached_reads()
                     time.sleep(0.5)
                     st.rerun()
                 else:
@@ -133,15 +157,16 @@ def render_disaster_recovery_dashboard():
         # Provider Scores
         st.subheader("Provider Scoring Analysis")
         
-        # Calculate scores for all providers
-        scores = {}
-        for provider in ["aws", "azure", "gcp"]:
-            scores[provider] = advanced_failover_manager.calculate_provider_score(provider, health_status)
+        # Calculate scores for all providers once, reused by the chart and the breakdown table
+        breakdowns = {
+            provider: advanced_failover_manager.calculate_provider_score_breakdown(provider, health_status)
+            for provider in ["aws", "azure", "gcp"]
+        }
         
         # Create a bar chart of provider scores
         score_df = pd.DataFrame({
-            "Provider": list(scores.keys()),
-            "Score": list(scores.values())
+            "Provider": list(breakdowns.keys()),
+            "Score": [breakdown["total"] for breakdown in breakdowns.values()]
         })
         
         fig = px.bar(
@@ -180,72 +205,44 @@ def render_disaster_recovery_dashboard():
         # Score Component Breakdown
         st.subheader("Score Component Breakdown")
         
-        # Get performance data
-        performance_data = get_performance_data()
-        
         # Create a table of scoring factors
-        factor_data = []
-        
-        for provider in ["aws", "azure", "gcp"]:
-            # Health Status
-            is_healthy = provider in health_status and health_status[provider].get('status', False)
-            health_score = 50 if is_healthy else 0
-            
-            # Recent history score calculation (simplified)
-            history = advanced_failover_manager.health_history.get(provider, [])
-            if history:
-                recent_health_ratio = sum(1 for status in history if status.get('healthy', False)) / len(history)
-                history_score = 20 * recent_health_ratio * advanced_failover_manager.provider_weights[provider]['reliability']
-            else:
-                history_score = 0
-            
-            # Performance score calculation (simplified)
-            if provider in performance_data:
-                perf = performance_data[provider]
-                response_time = perf.get('average_response_time', 0.5)
-                response_score = max(0, 10 - (response_time * 10))
-                success_rate = perf.get('request_success_rate', 95) / 100
-                success_score = success_rate * 10
-                perf_score = (response_score + success_score) * advanced_failover_manager.provider_weights[provider]['performance']
-            else:
-                perf_score = 0
-            
-            # Cost score approximation
-            cost_score = scores[provider] - (health_score + history_score + perf_score)
-            
-            factor_data.append({
-                "Provider": provider.upper(),
-                "Health Status": round(health_score, 1),
-                "Reliability History": round(history_score, 1),
-                "Performance": round(perf_score, 1),
-                "Cost Efficiency": round(cost_score, 1),
-                "Total Score": round(scores[provider], 1)
-            })
+        factor_rows = [
+            (
+                provider.upper(),
+                round(breakdown["health"], 1),
+                round(breakdown["history"], 1),
+                round(breakdown["performance"], 1),
+                round(breakdown["failover_penalty"], 1),
+                round(breakdown["cost"], 1),
+                round(breakdown["total"], 1)
+            )
+            for provider, breakdown in breakdowns.items()
+        ]
         
         # Convert to DataFrame and display
-        factor_df = pd.DataFrame(factor_data)
+        factor_df = pd.DataFrame(factor_rows, columns=[
+            "Provider", "Health Status", "Reliability History", "Performance",
+            "Recent Failover Penalty", "Cost Efficiency", "Total Score"
+        ])
         st.dataframe(factor_df, use_container_width=True)
     
     # Failover History Section
     st.header("Failover Event History")
     
-    # Get recent failover events
-    recent_events = advanced_failover_manager.get_recent_failover_events(limit=10)
-    
     if recent_events:
         # Convert to DataFrame
-        event_data = []
-        
-        for event in recent_events:
-            event_data.append({
-                "Time": datetime.fromisoformat(event["occurred_at"]).strftime("%Y-%m-%d %H:%M:%S"),
-                "From": event["from_provider"].upper(),
-                "To": event["to_provider"].upper(),
-                "Reason": event["reason"] if "reason" in event else "Not specified",
-                "Type": "Manual" if event.get("is_manual", False) else "Automatic"
-            })
+        event_rows = [
+            (
+                datetime.fromisoformat(event["occurred_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+                event["from_provider"].upper(),
+                event["to_provider"].upper(),
+                event["reason"] if "reason" in event else "Not specified",
+                "Manual" if event.get("is_manual", False) else "Automatic"
+            )
+            for event in recent_events
+        ]
         
-        events_df = pd.DataFrame(event_data)
+        events_df = pd.DataFrame(event_rows, columns=["Time", "From", "To", "Reason", "Type"])
         st.dataframe(events_df, use_container_width=True)
     else:
         st.info("No failover events have occurred yet.")
@@ -263,9 +260,6 @@ def render_disaster_recovery_dashboard():
     # Disaster Recovery Metrics
     st.header("Disaster Recovery Metrics")
     
-    # Get recovery metrics
-    recovery_metrics = db_manager.get_recovery_metrics()
-    
     if recovery_metrics:
         # Convert to DataFrame
         metrics_df = pd.DataFrame.from_dict(recovery_metrics, orient='index')
@@ -274,14 +268,14 @@ def render_disaster_recovery_dashboard():
         
         # Format columns
         if 'RPO' in metrics_df.columns:
-            metrics_df['RPO'] = metrics_df['RPO'].apply(lambda x: f"{x} min")
+            metrics_df['RPO'] = metrics_df['RPO'].astype(str) + " min"
         
         if 'Cost' in metrics_df.columns:
-            metrics_df['Cost'] = metrics_df['Cost'].apply(lambda x: f"${x}")
+            metrics_df['Cost'] = "$" + metrics_df['Cost'].astype(str)
         
         for col in ['Downtime', 'RTO', 'Failover Time']:
             if col in metrics_df.columns:
-                metrics_df[col] = metrics_df[col].apply(lambda x: f"{x} s")
+                metrics_df[col] = metrics_df[col].astype(str) + " s"
         
         st.dataframe(metrics_df, use_container_width=True)
         
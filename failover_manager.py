@@ -1,30 +1,88 @@
-import json
+import atexit
 import logging
 import os
+import queue
+import signal
 import threading
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 from config import (
     FAILOVER_ORDER, 
     ACTIVE_PROVIDER_FILE, 
     DEFAULT_PROVIDER,
-    FAILOVER_LOG_FILE,
-    HEALTH_STATUS_FILE
+    FAILOVER_LOG_FILE
 )
-from health_check import get_current_health_status
+from health_check import (
+    add_status_listener,
+    get_current_health_status,
+    get_status_round,
+    remove_status_listener
+)
+from json_files import file_version, read_json_cached, to_json, write_json_atomic
 from db_manager import db_manager
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(FAILOVER_LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+# Setup logging; records are queued and written by a background listener
+# so file I/O stays off the monitoring thread
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler(FAILOVER_LOG_FILE),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger('failover_manager')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# Failover events are also appended to the failover log as JSON lines. Every
+# manager shares one handle; lines reach the OS on every write and a
+# background thread fsyncs them in batches
+_failover_log = open(FAILOVER_LOG_FILE, 'a', buffering=1)
+_failover_log_lock = threading.Lock()
+_failover_log_dirty = False
+
+def _write_failover_log(line):
+    """Append a line to the failover log"""
+    global _failover_log_dirty
+    with _failover_log_lock:
+        _failover_log.write(line + '\n')
+        _failover_log_dirty = True
+
+def _sync_failover_log():
+    """Flush pending failover log lines to disk"""
+    global _failover_log_dirty
+    with _failover_log_lock:
+        if not _failover_log_dirty or _failover_log.closed:
+            return
+        try:
+            os.fsync(_failover_log.fileno())
+            _failover_log_dirty = False
+        except Exception as e:
+            logger.error(f"Failed to sync failover log: {str(e)}")
+
+def _run_failover_log_sync(interval=0.5):
+    """Periodically fsync the failover log if events were written"""
+    while True:
+        time.sleep(interval)
+        _sync_failover_log()
+
+def _close_failover_log():
+    """Sync and close the failover log on shutdown"""
+    _sync_failover_log()
+    with _failover_log_lock:
+        _failover_log.close()
+
+threading.Thread(target=_run_failover_log_sync, daemon=True).start()
+atexit.register(_close_failover_log)
 
 class FailoverManager:
     def __init__(self):
@@ -32,47 +90,82 @@ class FailoverManager:
         # Make sure directory for active provider file exists
         os.makedirs(os.path.dirname(ACTIVE_PROVIDER_FILE), exist_ok=True)
         
+        # Failover candidates to try, in order, when each provider fails
+        self._chains = {p: tuple(self._walk_chain(p)) for p in FAILOVER_ORDER}
+        self._default_chain = tuple(self._walk_chain(None))
+        
+        # Serializes active provider writes from the monitor thread and manual failovers
+        self._write_lock = threading.Lock()
+        
         # Initialize active provider file if it doesn't exist
         if not os.path.exists(ACTIVE_PROVIDER_FILE):
             self._save_active_provider(DEFAULT_PROVIDER)
         
         self.active_provider = self._load_active_provider()
+        self._active_provider_version = file_version(ACTIVE_PROVIDER_FILE)
+        
+        # (health check round, active provider) of the last check that needed no failover
+        self._last_seen_healthy = None
+        
+        # Monitoring thread state, see start_monitoring
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        # Set by new health results or stop() to cut the wait between checks
+        # short; registered with the health checker while monitoring runs
+        self._wake_event = threading.Event()
         
     def _load_active_provider(self):
         """Load the active provider from file"""
         try:
             if os.path.exists(ACTIVE_PROVIDER_FILE):
-                with open(ACTIVE_PROVIDER_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get('active_provider', DEFAULT_PROVIDER)
+                data = read_json_cached(ACTIVE_PROVIDER_FILE)
+                return data.get('active_provider', DEFAULT_PROVIDER)
             return DEFAULT_PROVIDER
         except Exception as e:
             logger.error(f"Failed to load active provider: {str(e)}")
             return DEFAULT_PROVIDER
     
+    def _current_provider(self):
+        """Return the active provider, re-reading the file only if another manager changed it"""
+        version = file_version(ACTIVE_PROVIDER_FILE)
+        if version != self._active_provider_version:
+            self.active_provider = self._load_active_provider()
+            self._active_provider_version = version
+        return self.active_provider
+    
     def _save_active_provider(self, provider):
         """Save the active provider to file"""
         try:
-            with open(ACTIVE_PROVIDER_FILE, 'w') as f:
-                json.dump({
+            with self._write_lock:
+                write_json_atomic(ACTIVE_PROVIDER_FILE, {
                     'active_provider': provider,
                     'updated_at': datetime.now().isoformat()
-                }, f)
+                })
+                # Our own write isn't an outside change
+                self._active_provider_version = file_version(ACTIVE_PROVIDER_FILE)
         except Exception as e:
             logger.error(f"Failed to save active provider: {str(e)}")
     
     def check_and_failover(self):
         """Check health status and initiate failover if needed"""
         try:
+            # Nothing to do if no new health round has landed since we last
+            # saw the active provider healthy; without a health checker in this
+            # process there's no round to compare, so always check
+            status_round = get_status_round()
+            current_provider = self._current_provider()
+            seen = (status_round, current_provider)
+            if status_round is not None and seen == self._last_seen_healthy:
+                return False
+            
             # Get health status using the function that checks both DB and file
             health_status = get_current_health_status()
             
             if not health_status:
                 logger.error("Health status not available")
                 return False
-                
-            # Get current active provider
-            current_provider = self._load_active_provider()
             
             # Check if current provider is healthy
             if current_provider in health_status:
@@ -80,26 +173,30 @@ class FailoverManager:
                 
                 if not current_provider_healthy:
                     # Initiate failover
+                    self._last_seen_healthy = None
                     self._perform_failover(current_provider, health_status)
                     return True
             
+            self._last_seen_healthy = seen
             return False
         
         except Exception as e:
             logger.error(f"Error in check_and_failover: {str(e)}")
             return False
     
+    @staticmethod
+    def _walk_chain(provider):
+        """Yield the providers FAILOVER_ORDER leads to after the given one"""
+        next_provider = FAILOVER_ORDER.get(provider, DEFAULT_PROVIDER)
+        for _ in range(len(FAILOVER_ORDER)):
+            yield next_provider
+            next_provider = FAILOVER_ORDER.get(next_provider, DEFAULT_PROVIDER)
+    
     def _perform_failover(self, failed_provider, health_status):
         """Perform failover to next available provider"""
-        # Determine next provider in failover order
-        next_provider = FAILOVER_ORDER.get(failed_provider, DEFAULT_PROVIDER)
-        
-        # Find a healthy provider
-        attempts = 0
-        max_attempts = len(FAILOVER_ORDER)
-        
-        while attempts < max_attempts:
-            if next_provider in health_status and health_status[next_provider].get('status', False):
+        # Find the first healthy provider in the failover chain
+        for next_provider in self._chains.get(failed_provider, self._default_chain):
+            if health_status.get(next_provider, {}).get('status', False):
                 # Found a healthy provider
                 logger.info(f"Initiating failover from {failed_provider} to {next_provider}")
                 
@@ -123,10 +220,6 @@ class FailoverManager:
                 self._log_failover_event(failed_provider, next_provider, reason)
                 
                 return True
-            
-            # Try the next provider in the chain
-            next_provider = FAILOVER_ORDER.get(next_provider, DEFAULT_PROVIDER)
-            attempts += 1
         
         logger.error(f"Failed to find a healthy provider for failover from {failed_provider}")
         return False
@@ -155,31 +248,44 @@ class FailoverManager:
         
         # Also log event to failover log file as backup
         try:
-            with open(FAILOVER_LOG_FILE, 'a') as f:
-                f.write(json.dumps(event) + '\n')
+            _write_failover_log(to_json(event))
         except Exception as e:
             logger.error(f"Failed to log failover event to file: {str(e)}")
     
     def run_failover_check_thread(self, interval=10):
         """Run failover checks in a loop at specified intervals"""
-        while True:
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
             self.check_and_failover()
-            time.sleep(interval)
+            self._wake_event.wait(interval)
     
     def start_monitoring(self, interval=10):
         """Start failover monitoring in a background thread"""
-        failover_thread = threading.Thread(
-            target=self.run_failover_check_thread,
-            args=(interval,),
-            daemon=True
-        )
-        failover_thread.start()
+        with self._start_lock:
+            # Only ever run one monitoring thread per manager
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            
+            self._stop_event.clear()
+            add_status_listener(self._wake_event)
+            self._thread = threading.Thread(
+                target=self.run_failover_check_thread,
+                args=(interval,),
+                daemon=True
+            )
+            self._thread.start()
         logger.info(f"Failover monitoring started in background thread (interval: {interval}s)")
-        return failover_thread
+        return self._thread
+    
+    def stop(self):
+        """Ask the monitoring thread to exit after its current check"""
+        self._stop_event.set()
+        self._wake_event.set()
+        remove_status_listener(self._wake_event)
     
     def manual_failover(self, to_provider, reason="Manual failover"):
         """Manually trigger failover to specified provider"""
-        current_provider = self._load_active_provider()
+        current_provider = self._current_provider()
         
         if current_provider == to_provider:
             logger.info(f"Provider {to_provider} is already active. No failover needed.")
@@ -204,9 +310,8 @@ def get_active_provider():
     """Get the current active provider"""
     try:
         if os.path.exists(ACTIVE_PROVIDER_FILE):
-            with open(ACTIVE_PROVIDER_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('active_provider', DEFAULT_PROVIDER)
+            data = read_json_cached(ACTIVE_PROVIDER_FILE)
+            return data.get('active_provider', DEFAULT_PROVIDER)
         return DEFAULT_PROVIDER
     except Exception as e:
         logger.error(f"Failed to get active provider: {str(e)}")
@@ -216,9 +321,8 @@ if __name__ == "__main__":
     # When run directly, start failover monitoring
     manager = FailoverManager()
     manager.start_monitoring()
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Failover monitoring stopped")
+    # Keep main thread alive, blocked until Ctrl+C instead of polling
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    stop.wait()
+    print("Failover monitoring stopped")
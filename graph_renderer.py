@@ -1,12 +1,30 @@
+import time
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from config import METRICS_FILE
+from json_files import file_version
 from metrics_table import get_metrics_dataframe
 
+# Metrics DataFrame shared by the charts on one page render
+_df_cache = {"version": None, "time": 0.0, "df": None}
+
+def _cached_metrics_df(ttl=2.0):
+    """Get the metrics DataFrame, rebuilding it when the metrics file changes or the TTL expires"""
+    version = file_version(METRICS_FILE)
+    now = time.monotonic()
+    if _df_cache["df"] is None or _df_cache["version"] != version or now - _df_cache["time"] > ttl:
+        _df_cache["df"] = get_metrics_dataframe()
+        _df_cache["version"] = version
+        _df_cache["time"] = now
+    return _df_cache["df"]
+
 def create_performance_bar_chart():
     """Create a bar chart of performance metrics"""
-    df = get_metrics_dataframe()
+    df = _cached_metrics_df()
     
     # Melt the DataFrame to get it into a format suitable for plotting
     melted_df = pd.melt(
@@ -41,7 +59,7 @@ def create_performance_bar_chart():
 
 def create_cost_bar_chart():
     """Create a bar chart of cost metrics"""
-    df = get_metrics_dataframe()
+    df = _cached_metrics_df()
     
     # Create the bar chart
     fig = px.bar(
@@ -69,7 +87,7 @@ def create_cost_bar_chart():
 
 def create_rto_rpo_scatter():
     """Create a scatter plot of RTO vs RPO"""
-    df = get_metrics_dataframe()
+    df = _cached_metrics_df()
     
     # Create the scatter plot
     fig = px.scatter(
@@ -100,7 +118,7 @@ def create_rto_rpo_scatter():
 
 def create_downtime_comparison_chart():
     """Create a horizontal bar chart comparing downtime across scenarios"""
-    df = get_metrics_dataframe()
+    df = _cached_metrics_df()
     
     # Sort by downtime
     df = df.sort_values('Downtime', ascending=True)
@@ -128,34 +146,28 @@ def create_downtime_comparison_chart():
 
 def create_metrics_radar_chart():
     """Create a radar chart of all metrics for each scenario"""
-    df = get_metrics_dataframe()
-    
-    # Get unique scenarios
-    scenarios = df['Scenario'].unique()
+    df = _cached_metrics_df()
     
     # Define metrics for radar chart
     metrics = ['Downtime', 'RTO', 'RPO', 'Failover Time', 'Cost']
     
+    # Normalize every metric to a 0-1 scale in one pass; constant columns become 0
+    values = df[metrics].to_numpy(dtype=np.float64)
+    metric_min = values.min(axis=0)
+    metric_range = values.max(axis=0) - metric_min
+    normalized = (values - metric_min) / np.where(metric_range > 0, metric_range, 1.0)
+    
     # Create radar chart
     fig = go.Figure()
     
-    for scenario in scenarios:
-        scenario_data = df[df['Scenario'] == scenario]
-        
-        # Normalize data for radar chart (0-1 scale)
-        values = []
-        for metric in metrics:
-            metric_max = df[metric].max()
-            metric_min = df[metric].min()
-            normalized = (scenario_data[metric].values[0] - metric_min) / (metric_max - metric_min) if metric_max > metric_min else 0
-            values.append(normalized)
-        
-        # Add a new trace for each scenario
+    # One trace per scenario, using its first row as before
+    first_rows = np.flatnonzero(~df['Scenario'].duplicated().to_numpy())
+    for row in first_rows:
         fig.add_trace(go.Scatterpolar(
-            r=values,
+            r=normalized[row].tolist(),
             theta=metrics,
             fill='toself',
-            name=scenario
+            name=df['Scenario'].iat[row]
         ))
     
     # Update layout
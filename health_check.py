@@ -1,25 +1,78 @@
-import json
+import atexit
 import logging
 import os
+import queue
 import requests
+import signal
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-from config import CLOUD_ENDPOINTS, HEALTH_CHECK_INTERVAL, HEALTH_STATUS_FILE
-from db_manager import db_manager
+from requests.adapters import HTTPAdapter
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/health_check.log'),
-        logging.StreamHandler()
-    ]
+from config import (
+    CLOUD_ENDPOINTS,
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_MAX_INTERVAL,
+    HEALTH_CHECK_MIN_INTERVAL,
+    HEALTH_STATUS_FILE
 )
+from json_files import read_json_cached, write_json_atomic
+from db_manager import db_manager
+
+# Setup logging; records are queued and written by a background listener
+# so file I/O stays off the monitoring thread
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/health_check.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger('health_check')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# One worker per provider so every probe in a round runs concurrently
+_probe_executor = ThreadPoolExecutor(max_workers=len(CLOUD_ENDPOINTS), thread_name_prefix="health-probe")
+
+# Latest round of results from a HealthChecker running in this process; readers
+# share the snapshot, so it's replaced as a whole and never modified
+_latest_status = None
+
+# Number of the round _latest_status came from, published after the snapshot so
+# a reader that sees a new round always sees at least that round's results
+_status_round = None
+
+# Events set whenever a new round of results is published; held weakly so
+# listeners that are never removed don't pile up
+_status_listeners = weakref.WeakSet()
+_status_listeners_lock = threading.Lock()
+
+def add_status_listener(event):
+    """Have event set each time a health check round finishes"""
+    with _status_listeners_lock:
+        _status_listeners.add(event)
+
+def get_status_round():
+    """Return the number of the latest health check round run in this process, or None"""
+    return _status_round
+
+def remove_status_listener(event):
+    """Stop setting event when health check rounds finish"""
+    with _status_listeners_lock:
+        _status_listeners.discard(event)
 
 class HealthChecker:
     def __init__(self):
@@ -29,110 +82,217 @@ class HealthChecker:
                       for provider in self.endpoints.keys()}
         self.timeout = 5  # seconds
         
+        # Last probe outcome per provider, so repeats are logged quietly
+        self._last_status = {}
+        
+        # Provider states last written to the status file
+        self._last_saved_state = None
+        
+        # Monitoring thread state, see start_monitoring
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        # Reuse keep-alive connections across probes instead of a new TCP/TLS
+        # handshake for every request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=len(self.endpoints),
+            pool_maxsize=len(self.endpoints),
+            max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+        
         # Create directory for health status file if it doesn't exist
         os.makedirs(os.path.dirname(HEALTH_STATUS_FILE), exist_ok=True)
         
         # Initialize health status file if it doesn't exist
         if not os.path.exists(HEALTH_STATUS_FILE):
-            with open(HEALTH_STATUS_FILE, 'w') as f:
-                json.dump(self.status, f)
+            write_json_atomic(HEALTH_STATUS_FILE, self.status)
 
     def check_health(self):
         """Check the health of all cloud providers"""
-        for provider, endpoint in self.endpoints.items():
-            try:
-                # Perform health check
-                response = requests.get(endpoint, timeout=self.timeout)
-                
-                # Update status based on response
-                if response.status_code == 200:
-                    status_info = {
-                        "status": True, 
-                        "last_checked": datetime.now().isoformat(),
-                        "response_time": response.elapsed.total_seconds()
-                    }
-                    self.status[provider] = status_info
-                    logger.info(f"{provider.upper()} health check: OK")
-                    
-                    # Record health check in database
-                    db_manager.record_health_check(
-                        provider_name=provider,
-                        status=True,
-                        response_time=response.elapsed.total_seconds()
-                    )
-                else:
-                    status_info = {
+        # One timestamp for the whole round
+        checked_at = datetime.now().isoformat()
+        
+        # Probe every provider at once so one slow endpoint can't hold up the rest
+        futures = {
+            _probe_executor.submit(self._probe, provider, endpoint, checked_at): provider
+            for provider, endpoint in self.endpoints.items()
+        }
+        
+        try:
+            for future in as_completed(futures, timeout=self.timeout + 0.5):
+                self.status[futures[future]] = future.result()
+        except FuturesTimeoutError:
+            # Mark any provider whose probe hasn't returned as unhealthy
+            for future, provider in futures.items():
+                if not future.done():
+                    error = "probe deadline exceeded"
+                    self.status[provider] = {
                         "status": False,
-                        "last_checked": datetime.now().isoformat(),
-                        "response_time": response.elapsed.total_seconds(),
-                        "status_code": response.status_code
+                        "last_checked": checked_at,
+                        "error": error
                     }
-                    self.status[provider] = status_info
-                    logger.warning(f"{provider.upper()} health check failed with status code: {response.status_code}")
-                    
-                    # Record health check in database
+                    self._log_result(provider, False, logging.ERROR, f"{provider.upper()} health check error: {error}")
                     db_manager.record_health_check(
                         provider_name=provider,
                         status=False,
-                        response_time=response.elapsed.total_seconds(),
-                        status_code=response.status_code
+                        error_message=error
                     )
+        
+        # Save status to file
+        self._save_status()
+    
+    def _probe(self, provider, endpoint, checked_at):
+        """Check a single provider and return its status"""
+        try:
+            # Perform health check; only the status line matters, so skip the body
+            response = self.session.head(endpoint, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # Endpoint doesn't support HEAD
+                response = self.session.get(endpoint, timeout=self.timeout)
             
-            except requests.exceptions.RequestException as e:
-                # Handle request exceptions (timeout, connection error, etc.)
+            # Update status based on response
+            if response.status_code == 200:
+                status_info = {
+                    "status": True, 
+                    "last_checked": checked_at,
+                    "response_time": response.elapsed.total_seconds()
+                }
+                self._log_result(provider, True, logging.INFO, f"{provider.upper()} health check: OK")
+                
+                # Record health check in database
+                db_manager.record_health_check(
+                    provider_name=provider,
+                    status=True,
+                    response_time=response.elapsed.total_seconds()
+                )
+            else:
                 status_info = {
                     "status": False,
-                    "last_checked": datetime.now().isoformat(),
-                    "error": str(e)
+                    "last_checked": checked_at,
+                    "response_time": response.elapsed.total_seconds(),
+                    "status_code": response.status_code
                 }
-                self.status[provider] = status_info
-                logger.error(f"{provider.upper()} health check error: {str(e)}")
+                self._log_result(provider, False, logging.WARNING, f"{provider.upper()} health check failed with status code: {response.status_code}")
                 
                 # Record health check in database
                 db_manager.record_health_check(
                     provider_name=provider,
                     status=False,
-                    error_message=str(e)
+                    response_time=response.elapsed.total_seconds(),
+                    status_code=response.status_code
                 )
         
-        # Save status to file
-        self._save_status()
+        except requests.exceptions.RequestException as e:
+            # Handle request exceptions (timeout, connection error, etc.)
+            status_info = {
+                "status": False,
+                "last_checked": checked_at,
+                "error": str(e)
+            }
+            self._log_result(provider, False, logging.ERROR, f"{provider.upper()} health check error: {str(e)}")
+            
+            # Record health check in database
+            db_manager.record_health_check(
+                provider_name=provider,
+                status=False,
+                error_message=str(e)
+            )
+        
+        return status_info
+    
+    def _log_result(self, provider, healthy, level, message):
+        """Log a probe result, demoting it to debug if the provider's state hasn't changed"""
+        if self._last_status.get(provider) is healthy:
+            level = logging.DEBUG
+        self._last_status[provider] = healthy
+        logger.log(level, message)
         
     def _save_status(self):
-        """Save the current health status to a JSON file"""
-        try:
-            with open(HEALTH_STATUS_FILE, 'w') as f:
-                json.dump(self.status, f)
-        except Exception as e:
-            logger.error(f"Failed to save health status: {str(e)}")
+        """Publish the current health status and save it to a JSON file"""
+        global _latest_status, _status_round
+        _latest_status = dict(self.status)
+        _status_round = (_status_round or 0) + 1
+        
+        # Leave the file alone unless some provider's state changed; timings
+        # and check times alone aren't worth a rewrite
+        state = tuple(
+            (provider, info.get("status"), info.get("status_code"), info.get("error"))
+            for provider, info in self.status.items()
+        )
+        if state != self._last_saved_state:
+            try:
+                write_json_atomic(HEALTH_STATUS_FILE, self.status)
+                self._last_saved_state = state
+            except Exception as e:
+                logger.error(f"Failed to save health status: {str(e)}")
+        
+        # Let waiting failover checks act on the new round right away
+        with _status_listeners_lock:
+            listeners = list(_status_listeners)
+        for event in listeners:
+            event.set()
 
     def run_health_check_thread(self):
-        """Run health checks in a loop at specified intervals"""
-        while True:
+        """Run health checks in a loop, backing off while providers are stable"""
+        interval = HEALTH_CHECK_INTERVAL
+        previous = None
+        next_round = time.monotonic()
+        while not self._stop_event.is_set():
             self.check_health()
-            time.sleep(HEALTH_CHECK_INTERVAL)
+            
+            current = tuple(info.get("status") for info in self.status.values())
+            if previous is not None:
+                if current == previous:
+                    interval = min(interval * 2, HEALTH_CHECK_MAX_INTERVAL)
+                else:
+                    interval = HEALTH_CHECK_MIN_INTERVAL
+            previous = current
+            
+            # Schedule from the start of this round so probe time doesn't
+            # stretch the period; if a round overran, start the next one now
+            now = time.monotonic()
+            next_round = max(next_round + interval, now)
+            self._stop_event.wait(next_round - now)
             
     def start_monitoring(self):
         """Start health monitoring in a background thread"""
-        health_thread = threading.Thread(target=self.run_health_check_thread, daemon=True)
-        health_thread.start()
+        with self._start_lock:
+            # Only ever run one monitoring thread per checker
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.run_health_check_thread, daemon=True)
+            self._thread.start()
         logger.info("Health monitoring started in background thread")
-        return health_thread
+        return self._thread
+    
+    def stop(self):
+        """Ask the monitoring thread to exit after its current round"""
+        self._stop_event.set()
 
-def get_current_health_status():
+def get_current_health_status(session=None):
     """Get the current health status"""
     try:
-        # Try to get health status from database first
-        db_status = db_manager.get_health_status()
+        # Use the in-process results when this process runs the health checker
+        if _latest_status is not None:
+            return _latest_status
+        
+        # Otherwise try the database
+        db_status = db_manager.get_health_status(session=session)
         if db_status:
             return db_status
         
         # Fall back to file if database fails
-        if os.path.exists(HEALTH_STATUS_FILE):
-            with open(HEALTH_STATUS_FILE, 'r') as f:
-                return json.load(f)
-        
-        return {}
+        try:
+            return read_json_cached(HEALTH_STATUS_FILE)
+        except FileNotFoundError:
+            return {}
     except Exception as e:
         logger.error(f"Failed to read health status: {str(e)}")
         return {}
@@ -141,9 +301,8 @@ if __name__ == "__main__":
     # When run directly, start health monitoring
     checker = HealthChecker()
     checker.start_monitoring()
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Health check monitoring stopped")
+    # Keep main thread alive, blocked until Ctrl+C instead of polling
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    stop.wait()
+    print("Health check monitoring stopped")
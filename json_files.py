@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed JSON files keyed by path, stored as ((mtime_ns, size), data)
+_cache = {}
+_cache_lock = threading.Lock()
+
+def to_json(obj):
+    """Serialize obj to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+def load_json(path):
+    """Read and parse a JSON file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def file_version(path):
+    """Return a token that changes whenever the file is rewritten, or None if it's missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_json_cached(path):
+    """Load a JSON file, re-parsing it only when its modification time changes
+
+    The returned object is shared between callers and must not be modified.
+    Raises FileNotFoundError if the file doesn't exist.
+    """
+    version = file_version(path)
+    if version is None:
+        raise FileNotFoundError(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with _cache_lock:
+        # Another thread may have loaded it while we waited
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        data = load_json(path)
+        _cache[path] = (version, data)
+        return data
+
+def _replace_atomic(path, mode, content, durable=False):
+    """Write content to a temporary file and rename it over path"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            f.write(content)
+            if durable:
+                # Make sure the data is on disk before the rename makes it
+                # visible, so a crash can't leave an empty file behind
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave the temporary file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def write_text_atomic(path, text):
+    """Replace path with text; readers see either the old or the new content"""
+    _replace_atomic(path, 'w', text)
+
+def write_json_atomic(path, data, durable=False):
+    """Write JSON to a temporary file and rename it over path
+
+    Readers see either the old or the new content, never a partial write.
+    Pass durable=True to fsync the data before the rename, for files that
+    must survive a crash rather than just never be seen half-written.
+    """
+    if orjson is not None:
+        _replace_atomic(path, 'wb', orjson.dumps(data), durable)
+    else:
+        _replace_atomic(path, 'w', json.dumps(data, separators=(',', ':')), durable)
@@ -1,10 +1,15 @@
+import atexit
 import os
+import queue
 import time
 import threading
 import streamlit as st
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+from config import CLOUD_STORAGE
 from health_check import HealthChecker
 from failover_manager import FailoverManager
 from backup_sync import BackupSyncManager
@@ -13,24 +18,40 @@ from dashboard import render_dashboard
 from database import init_db  # Import the database initialization function
 from advanced_failover import advanced_failover_manager
 
-# Ensure necessary directories exist
-os.makedirs("logs", exist_ok=True)
-os.makedirs("data", exist_ok=True)
-os.makedirs("mock_cloud_storage/aws_s3", exist_ok=True)
-os.makedirs("mock_cloud_storage/azure_blob", exist_ok=True)
-os.makedirs("mock_cloud_storage/gcp_bucket", exist_ok=True)
+# The data, logs and mock storage directories are created by config, which
+# the service modules above import
+
+# Set up logging; records are queued and written by a background listener
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/main.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/main.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('main')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
 
+def _add_test_files(directory, label, name_pattern, content_pattern, count):
+    """Write numbered test files into a mock storage directory if it's empty"""
+    if os.listdir(directory):
+        return
+    
+    logger.info(f"Adding test files to {label} mock directory")
+    for i in range(count):
+        Path(directory, name_pattern.format(i)).write_text(content_pattern.format(i))
+
+# Streamlit re-executes this script on every rerun; cache_resource keeps the
+# services started once per process and hands back the same threads after that
+@st.cache_resource
 def start_services():
     """Start all background services"""
     logger.info("Starting Multi-Cloud Disaster Recovery Framework services...")
@@ -43,60 +64,35 @@ def start_services():
         logger.error(f"Error initializing database: {str(e)}")
         logger.warning("Continuing with file-based storage as fallback")
     
-    # Start health checking service
-    health_checker = HealthChecker()
-    health_thread = health_checker.start_monitoring()
-    logger.info("Health checker started")
-    
-    # Start the primary failover manager (keeping for backward compatibility)
-    failover_manager = FailoverManager()
-    failover_thread = failover_manager.start_monitoring()
-    logger.info("Basic failover manager started")
-    
-    # Start advanced failover monitoring (using ML-based decision logic)
-    advanced_thread = advanced_failover_manager.start_monitoring(interval=15)
-    logger.info("Advanced failover manager started")
-    
-    # Start backup sync manager
-    backup_manager = BackupSyncManager()
-    backup_thread = backup_manager.start_backup_sync()
-    logger.info("Backup sync manager started")
-    
-    # Start performance monitoring
-    performance_monitor = PerformanceMonitor()
-    performance_thread = performance_monitor.start_monitoring()
-    logger.info("Performance monitoring started")
-    
-    # Add test files to AWS S3 mock directory if empty
-    aws_dir = "mock_cloud_storage/aws_s3"
-    if not os.listdir(aws_dir):
-        logger.info("Adding test files to AWS S3 mock directory")
-        for i in range(5):
-            test_file = os.path.join(aws_dir, f"test_file_{i}.txt")
-            with open(test_file, "w") as f:
-                f.write(f"This is test file {i} content")
-    
-    # Add test files to other cloud providers to simulate cross-cloud backup
-    azure_dir = "mock_cloud_storage/azure_blob"
-    gcp_dir = "mock_cloud_storage/gcp_bucket"
+    # Build and start the monitors concurrently; each does its own file and
+    # database setup, so startup waits only for the slowest one
+    starters = {
+        "Health checker": lambda: HealthChecker().start_monitoring(),
+        # Primary failover manager, kept for backward compatibility
+        "Basic failover manager": lambda: FailoverManager().start_monitoring(),
+        # Advanced failover monitoring (using ML-based decision logic)
+        "Advanced failover manager": lambda: advanced_failover_manager.start_monitoring(interval=15),
+        "Backup sync manager": lambda: BackupSyncManager().start_backup_sync(),
+        "Performance monitoring": lambda: PerformanceMonitor().start_monitoring()
+    }
+    with ThreadPoolExecutor(max_workers=len(starters)) as executor:
+        futures = {name: executor.submit(start) for name, start in starters.items()}
     
-    # Add a few unique files to each provider
-    if not os.listdir(azure_dir):
-        logger.info("Adding test files to Azure Blob mock directory")
-        for i in range(3):
-            test_file = os.path.join(azure_dir, f"azure_blob_{i}.txt")
-            with open(test_file, "w") as f:
-                f.write(f"This is Azure Blob storage file {i}")
+    threads = []
+    for name, future in futures.items():
+        threads.append(future.result())
+        logger.info(f"{name} started")
     
-    if not os.listdir(gcp_dir):
-        logger.info("Adding test files to GCP Bucket mock directory")
-        for i in range(2):
-            test_file = os.path.join(gcp_dir, f"gcp_bucket_{i}.txt")
-            with open(test_file, "w") as f:
-                f.write(f"This is GCP Bucket storage file {i}")
+    # Add test files to the mock storage directories if empty, with a few
+    # unique files per provider to simulate cross-cloud backup; set
+    # SEED_MOCK_STORAGE=0 to skip this
+    if os.environ.get("SEED_MOCK_STORAGE", "1") != "0":
+        _add_test_files(CLOUD_STORAGE["aws"], "AWS S3", "test_file_{}.txt", "This is test file {} content", 5)
+        _add_test_files(CLOUD_STORAGE["azure"], "Azure Blob", "azure_blob_{}.txt", "This is Azure Blob storage file {}", 3)
+        _add_test_files(CLOUD_STORAGE["gcp"], "GCP Bucket", "gcp_bucket_{}.txt", "This is GCP Bucket storage file {}", 2)
     
     logger.info("All services started successfully")
-    return health_thread, failover_thread, advanced_thread, backup_thread, performance_thread
+    return tuple(threads)
 
 def main():
     """Main entry point for the application"""
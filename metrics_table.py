@@ -1,25 +1,33 @@
-import json
 import os
+import threading
 import pandas as pd
 from datetime import datetime
 
 from config import INITIAL_METRICS, METRICS_FILE
+from json_files import read_json_cached, write_json_atomic
+
+# Serializes read-modify-write cycles on the metrics file, e.g. from
+# concurrent dashboard sessions, so one update can't drop another
+_metrics_lock = threading.Lock()
 
 def load_metrics():
-    """Load metrics from file or initialize with defaults"""
+    """Load metrics from file or initialize with defaults
+
+    The file is only re-parsed when it changes; the returned dict is shared
+    and must not be modified.
+    """
     try:
-        if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, 'r') as f:
-                return json.load(f)
-        else:
+        return read_json_cached(METRICS_FILE)
+    except FileNotFoundError:
+        try:
             # Create directory for metrics file if it doesn't exist
             os.makedirs(os.path.dirname(METRICS_FILE), exist_ok=True)
             
             # Initialize with default metrics
-            with open(METRICS_FILE, 'w') as f:
-                json.dump(INITIAL_METRICS, f)
-            
-            return INITIAL_METRICS
+            write_json_atomic(METRICS_FILE, INITIAL_METRICS, durable=True)
+        except Exception as e:
+            print(f"Error initializing metrics: {str(e)}")
+        return INITIAL_METRICS
     except Exception as e:
         print(f"Error loading metrics: {str(e)}")
         return INITIAL_METRICS
@@ -27,8 +35,7 @@ def load_metrics():
 def save_metrics(metrics):
     """Save metrics to file"""
     try:
-        with open(METRICS_FILE, 'w') as f:
-            json.dump(metrics, f)
+        write_json_atomic(METRICS_FILE, metrics, durable=True)
         return True
     except Exception as e:
         print(f"Error saving metrics: {str(e)}")
@@ -38,43 +45,48 @@ def get_metrics_dataframe():
     """Get metrics as a pandas DataFrame"""
     metrics = load_metrics()
     
-    # Convert metrics to DataFrame
-    df = pd.DataFrame.from_dict(metrics, orient='index')
+    # One record per scenario, with the scenario as a column
+    df = pd.DataFrame.from_records([{"Scenario": scenario, **values} for scenario, values in metrics.items()])
+    if df.empty:
+        return pd.DataFrame(columns=["Scenario"])
     
-    # Add scenario as a column
-    df.reset_index(inplace=True)
-    df.rename(columns={'index': 'Scenario'}, inplace=True)
+    # Scenario names repeat across charts; metrics fit in the smallest numeric type
+    df["Scenario"] = pd.Categorical(df["Scenario"], categories=list(metrics))
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="float")
     
     return df
 
 def update_metric(scenario, metric, value):
     """Update a specific metric value"""
-    metrics = load_metrics()
-    
-    if scenario in metrics and metric in metrics[scenario]:
-        metrics[scenario][metric] = value
-        save_metrics(metrics)
-        return True
+    with _metrics_lock:
+        metrics = load_metrics()
+        
+        if scenario in metrics and metric in metrics[scenario]:
+            # Copy the changed scenario rather than modifying the cached metrics
+            save_metrics({**metrics, scenario: {**metrics[scenario], metric: value}})
+            return True
     
     return False
 
 def add_metric_event(scenario, metrics_data):
     """Add a new metric event with timestamp"""
     try:
-        # Load existing metrics
-        all_metrics = load_metrics()
-        
         # Create new event with timestamp
         event = {
             **metrics_data,
             "timestamp": datetime.now().isoformat()
         }
         
-        # Add or update the scenario
-        all_metrics[scenario] = event
-        
-        # Save updated metrics
-        save_metrics(all_metrics)
+        with _metrics_lock:
+            # Add or update the scenario on a copy of the existing metrics
+            all_metrics = {**load_metrics(), scenario: event}
+            
+            # Save updated metrics
+            save_metrics(all_metrics)
         
         return True
     except Exception as e:
@@ -86,14 +98,18 @@ def get_formatted_metrics_table():
     df = get_metrics_dataframe()
     
     # Format numeric columns
-    for col in df.columns:
-        if col != 'Scenario' and col != 'timestamp':
-            if df[col].dtype in ['int64', 'float64']:
-                if col == 'Cost':
-                    df[col] = df[col].apply(lambda x: f"${x}")
-                elif col == 'RPO':
-                    df[col] = df[col].apply(lambda x: f"{x} min")
-                else:
-                    df[col] = df[col].apply(lambda x: f"{x} s")
+    numeric_cols = [
+        col for col in df.columns
+        if col != 'Scenario' and col != 'timestamp' and pd.api.types.is_numeric_dtype(df[col])
+    ]
+    if 'Cost' in numeric_cols:
+        df['Cost'] = "$" + df['Cost'].astype("string")
+    if 'RPO' in numeric_cols:
+        df['RPO'] = df['RPO'].astype("string") + " min"
+    
+    # Everything else is a duration in seconds; format them in one assignment
+    seconds_cols = [col for col in numeric_cols if col not in ('Cost', 'RPO')]
+    if seconds_cols:
+        df[seconds_cols] = df[seconds_cols].astype("string") + " s"
     
     return df
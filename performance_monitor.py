@@ -1,10 +1,15 @@
-import json
+import atexit
+import functools
+import inspect
 import logging
 import os
+import queue
 import random
+import signal
 import threading
 import time
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 
 from config import (
     CLOUD_PROVIDERS,
@@ -19,29 +24,130 @@ from config import (
 )
 
 from health_check import get_current_health_status
+from db_manager import db_manager
+from json_files import file_version, load_json, read_json_cached, write_json_atomic
 from failover_manager import get_active_provider
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/performance_monitor.log'),
-        logging.StreamHandler()
-    ]
-)
+# Setup logging once at import; records are queued and written by a
+# background listener so file I/O stays off the monitoring thread
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/performance_monitor.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger('performance_monitor')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# Ranges each generated metric is drawn from, per simulation mode; the
+# latency variation applies to the network latency history
+_METRIC_RANGES = {
+    "normal": {
+        "cpu_utilization": (10, 40),
+        "disk_iops": (500, 2000),
+        "network_throughput": (200, 1000),
+        "request_success_rate": (99.5, 100),
+        "latency_range": NETWORK_SIMULATION["normal"]["latency_range"],
+        "latency_variation": (-5, 10)
+    },
+    "degraded": {
+        "cpu_utilization": (60, 85),
+        "disk_iops": (200, 500),
+        "network_throughput": (50, 200),
+        "request_success_rate": (95, 99.5),
+        "latency_range": NETWORK_SIMULATION["degraded"]["latency_range"],
+        "latency_variation": (10, 50)
+    },
+    "failure": {
+        "cpu_utilization": (85, 100),
+        "disk_iops": (10, 200),
+        "network_throughput": (1, 50),
+        "request_success_rate": (0, 95),
+        "latency_range": NETWORK_SIMULATION["failure"]["latency_range"],
+        "latency_variation": (50, 200)
+    }
+}
+
+# Working copies of the data files, shared by every PerformanceMonitor in the
+# process as path -> (file version after our last load or write, data). Each
+# tick updates them in memory under _state_lock and writes only the files
+# that changed, once, at the end
+_state = {}
+_state_lock = threading.Lock()
+_dirty = set()
+
+# Hour or day bucket every provider's availability and cost history already
+# has an entry for, by path; until it rolls over those updates have nothing to do
+_buckets = {}
+
+def _upgrade_timestamps(history, path):
+    """Convert ISO timestamps from older history files to epoch seconds"""
+    for entries in history.values():
+        for entry in entries:
+            if isinstance(entry.get("timestamp"), str):
+                entry["timestamp"] = int(datetime.fromisoformat(entry["timestamp"]).timestamp())
+                _dirty.add(path)
+
+def _working_copy(path, default):
+    """Return the working copy of a data file, reloading it if another writer replaced the file
+
+    Call with _state_lock held.
+    """
+    version = file_version(path)
+    cached = _state.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    try:
+        data = load_json(path)
+    except Exception as e:
+        logger.error(f"Error loading {os.path.basename(path)}: {str(e)}")
+        data = default
+    if path in (AVAILABILITY_HISTORY_FILE, COST_HISTORY_FILE):
+        _upgrade_timestamps(data, path)
+    _state[path] = (version, data)
+    _buckets.pop(path, None)
+    return data
+
+def _flush():
+    """Write each data file changed since the last flush; call with _state_lock held"""
+    for path in list(_dirty):
+        data = _state[path][1]
+        try:
+            # The histories can't be rebuilt after a crash; the latest
+            # sample is replaced on the next tick anyway
+            write_json_atomic(path, data, durable=path != PERFORMANCE_DATA_FILE)
+            # Our own write isn't a change by another writer
+            _state[path] = (file_version(path), data)
+            _dirty.discard(path)
+        except Exception as e:
+            logger.error(f"Error saving {os.path.basename(path)}: {str(e)}")
 
 class PerformanceMonitor:
     def __init__(self):
         """Initialize the performance monitor"""
         self.providers = list(CLOUD_PROVIDERS.keys())
+        self._base_latency = {provider: info["base_latency"] for provider, info in CLOUD_PROVIDERS.items()}
+        # Response times are normalized against AWS latency
+        self._latency_factors = {provider: latency / 25 for provider, latency in self._base_latency.items()}
         self.init_performance_data()
         self.init_availability_history()
         self.init_cost_history()
         self.init_network_latency()
         self.simulation_mode = "normal"  # normal, degraded, failure
         
+        # Whether the last tick saw every provider healthy, see run_performance_monitor_thread
+        self._all_healthy = True
+        
     def init_performance_data(self):
         """Initialize performance data file if it doesn't exist"""
         try:
@@ -60,8 +166,7 @@ class PerformanceMonitor:
                 }
                 
                 os.makedirs(os.path.dirname(PERFORMANCE_DATA_FILE), exist_ok=True)
-                with open(PERFORMANCE_DATA_FILE, 'w') as f:
-                    json.dump(performance_data, f)
+                write_json_atomic(PERFORMANCE_DATA_FILE, performance_data)
                     
                 logger.info("Initialized performance data file")
         except Exception as e:
@@ -73,8 +178,7 @@ class PerformanceMonitor:
             if not os.path.exists(AVAILABILITY_HISTORY_FILE):
                 # Use initial availability history from config
                 os.makedirs(os.path.dirname(AVAILABILITY_HISTORY_FILE), exist_ok=True)
-                with open(AVAILABILITY_HISTORY_FILE, 'w') as f:
-                    json.dump(INITIAL_AVAILABILITY_HISTORY, f)
+                write_json_atomic(AVAILABILITY_HISTORY_FILE, INITIAL_AVAILABILITY_HISTORY, durable=True)
                     
                 logger.info("Initialized availability history file")
         except Exception as e:
@@ -86,8 +190,7 @@ class PerformanceMonitor:
             if not os.path.exists(COST_HISTORY_FILE):
                 # Use initial cost history from config
                 os.makedirs(os.path.dirname(COST_HISTORY_FILE), exist_ok=True)
-                with open(COST_HISTORY_FILE, 'w') as f:
-                    json.dump(INITIAL_COST_HISTORY, f)
+                write_json_atomic(COST_HISTORY_FILE, INITIAL_COST_HISTORY, durable=True)
                     
                 logger.info("Initialized cost history file")
         except Exception as e:
@@ -99,8 +202,7 @@ class PerformanceMonitor:
             if not os.path.exists(NETWORK_LATENCY_FILE):
                 # Use initial network latency from config
                 os.makedirs(os.path.dirname(NETWORK_LATENCY_FILE), exist_ok=True)
-                with open(NETWORK_LATENCY_FILE, 'w') as f:
-                    json.dump(INITIAL_NETWORK_LATENCY, f)
+                write_json_atomic(NETWORK_LATENCY_FILE, INITIAL_NETWORK_LATENCY, durable=True)
                     
                 logger.info("Initialized network latency file")
         except Exception as e:
@@ -113,77 +215,72 @@ class PerformanceMonitor:
             health_status = get_current_health_status()
             active_provider = get_active_provider()
             
-            # Load current performance data
-            if os.path.exists(PERFORMANCE_DATA_FILE):
-                with open(PERFORMANCE_DATA_FILE, 'r') as f:
-                    performance_data = json.load(f)
-            else:
-                performance_data = {}
-            
-            # Update performance data for each provider
-            for provider in self.providers:
-                is_healthy = provider in health_status and health_status[provider].get('status', False)
-                is_active = provider == active_provider
+            # The working copies are shared with other monitors in this process
+            with _state_lock:
+                # Updated in place; written out by _flush at the end of the tick
+                performance_data = _working_copy(PERFORMANCE_DATA_FILE, {})
                 
-                # Base performance influenced by health status
-                if not is_healthy:
-                    # Provider is unhealthy - use failure simulation mode
-                    sim_mode = "failure"
-                elif provider in performance_data and random.random() < 0.05:
-                    # Occasionally introduce degraded performance 
-                    sim_mode = "degraded"
-                else:
-                    # Normal operation
-                    sim_mode = self.simulation_mode
+                # One timestamp for every provider's sample this tick
+                timestamp = datetime.now().isoformat()
                 
-                # Generate performance metrics based on simulation mode
-                metrics = self._generate_performance_metrics(provider, sim_mode, is_active)
+                self._all_healthy = all(
+                    health_status.get(provider, {}).get('status', False) for provider in self.providers
+                )
                 
-                # Update performance data
-                performance_data[provider] = metrics
+                # Update performance data for each provider
+                for provider in self.providers:
+                    is_healthy = provider in health_status and health_status[provider].get('status', False)
+                    is_active = provider == active_provider
+                    
+                    # Base performance influenced by health status
+                    if not is_healthy:
+                        # Provider is unhealthy - use failure simulation mode
+                        sim_mode = "failure"
+                    elif provider in performance_data and random.random() < 0.05:
+                        # Occasionally introduce degraded performance 
+                        sim_mode = "degraded"
+                    else:
+                        # Normal operation
+                        sim_mode = self.simulation_mode
+                    
+                    # Generate performance metrics based on simulation mode
+                    metrics = self._generate_performance_metrics(provider, sim_mode, is_active, timestamp)
+                    
+                    # Update performance data
+                    performance_data[provider] = metrics
+                    
+                    # Store in database
+                    db_manager.record_performance_metrics(provider, metrics)
                 
-                # Store in database
-                from db_manager import db_manager
-                db_manager.record_performance_metrics(provider, metrics)
-            
-            # Save updated performance data to file as backup
-            with open(PERFORMANCE_DATA_FILE, 'w') as f:
-                json.dump(performance_data, f)
+                _dirty.add(PERFORMANCE_DATA_FILE)
+                logger.debug("Updated performance data")
                 
-            logger.debug("Updated performance data")
-            
-            # Update availability history
-            self._update_availability_history(health_status)
-            
-            # Update network latency
-            self._update_network_latency()
-            
-            # Occasionally update cost history (hourly)
-            if random.random() < 0.01:  # ~1% chance each update
-                self._update_cost_history()
-            
-            return performance_data
+                # Update availability history
+                self._update_availability_history(health_status)
+                
+                # Update network latency
+                self._update_network_latency()
+                
+                # Occasionally update cost history (hourly)
+                if random.random() < 0.01:  # ~1% chance each update
+                    self._update_cost_history(active_provider)
+                
+                # Save everything that changed this tick to file as backup
+                _flush()
+                
+                return dict(performance_data)
             
         except Exception as e:
             logger.error(f"Error updating performance data: {str(e)}")
             return {}
     
-    def _generate_performance_metrics(self, provider, sim_mode, is_active):
+    def _generate_performance_metrics(self, provider, sim_mode, is_active, timestamp):
         """Generate realistic performance metrics based on simulation mode"""
         # Get simulation parameters
-        sim_params = NETWORK_SIMULATION[sim_mode]
-        
-        # Base provider parameters
-        provider_info = CLOUD_PROVIDERS[provider]
-        base_latency = provider_info["base_latency"]
+        ranges = _METRIC_RANGES[sim_mode]
         
         # CPU utilization
-        if sim_mode == "normal":
-            cpu_util = random.uniform(10, 40)
-        elif sim_mode == "degraded":
-            cpu_util = random.uniform(60, 85)
-        else:  # failure
-            cpu_util = random.uniform(85, 100)
+        cpu_util = random.uniform(*ranges["cpu_utilization"])
             
         # Add more load if provider is active
         if is_active:
@@ -193,36 +290,17 @@ class PerformanceMonitor:
         memory_util = cpu_util * random.uniform(0.8, 1.2)
         memory_util = max(10, min(100, memory_util))
         
-        # Disk IOPS
-        if sim_mode == "normal":
-            disk_iops = random.randint(500, 2000)
-        elif sim_mode == "degraded":
-            disk_iops = random.randint(200, 500)
-        else:  # failure
-            disk_iops = random.randint(10, 200)
-        
-        # Network throughput (Mbps)
-        if sim_mode == "normal":
-            network_throughput = random.uniform(200, 1000)
-        elif sim_mode == "degraded":
-            network_throughput = random.uniform(50, 200)
-        else:  # failure
-            network_throughput = random.uniform(1, 50)
-        
-        # Request success rate
-        if sim_mode == "normal":
-            success_rate = random.uniform(99.5, 100)
-        elif sim_mode == "degraded":
-            success_rate = random.uniform(95, 99.5)
-        else:  # failure
-            success_rate = random.uniform(0, 95)
+        # Disk IOPS, network throughput (Mbps) and request success rate
+        disk_iops = random.randint(*ranges["disk_iops"])
+        network_throughput = random.uniform(*ranges["network_throughput"])
+        success_rate = random.uniform(*ranges["request_success_rate"])
         
         # Average response time (ms)
-        latency_min, latency_max = sim_params["latency_range"]
+        latency_min, latency_max = ranges["latency_range"]
         response_time = random.uniform(latency_min, latency_max) / 1000  # convert to seconds
         
         # Response time affected by base latency of provider
-        response_time = response_time * (base_latency / 25)  # normalize against AWS latency
+        response_time = response_time * self._latency_factors[provider]
         
         return {
             "cpu_utilization": round(cpu_util, 2),
@@ -231,81 +309,69 @@ class PerformanceMonitor:
             "network_throughput": round(network_throughput, 2),
             "request_success_rate": round(success_rate, 2),
             "average_response_time": round(response_time, 3),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
     
     def _update_availability_history(self, health_status):
-        """Update availability history with latest health status"""
+        """Update availability history with latest health status; call with _state_lock held"""
         try:
-            # Load current availability history
-            if os.path.exists(AVAILABILITY_HISTORY_FILE):
-                with open(AVAILABILITY_HISTORY_FILE, 'r') as f:
-                    availability_history = json.load(f)
-            else:
-                availability_history = {provider: [] for provider in self.providers}
+            availability_history = _working_copy(AVAILABILITY_HISTORY_FILE, {provider: [] for provider in self.providers})
             
-            # Get current time rounded to the hour
+            # Get current time rounded to the hour, as epoch seconds
             now = datetime.now()
-            current_hour = now.replace(minute=0, second=0, microsecond=0)
+            current_hour = int(now.replace(minute=0, second=0, microsecond=0).timestamp())
+            if current_hour == _buckets.get(AVAILABILITY_HISTORY_FILE):
+                return
             
             # Update for each provider
             for provider in self.providers:
                 # Check if we already have an entry for the current hour
                 provider_history = availability_history.get(provider, [])
                 
-                if not provider_history or datetime.fromisoformat(provider_history[-1]["timestamp"]).hour != current_hour.hour:
+                if not provider_history or provider_history[-1]["timestamp"] // 3600 != current_hour // 3600:
                     # Add new hourly entry
                     is_available = provider in health_status and health_status[provider].get('status', False)
                     response_time = health_status.get(provider, {}).get('response_time', None) if is_available else None
                     
                     provider_history.append({
-                        "timestamp": current_hour.isoformat(),
+                        "timestamp": current_hour,
                         "status": is_available,
                         "response_time": response_time
                     })
                     
-                    # Keep only the last 24 hours of data
+                    # Keep only the last 24 hours of data, trimming in place
                     if len(provider_history) > 24:
-                        provider_history = provider_history[-24:]
+                        del provider_history[:-24]
                     
                     availability_history[provider] = provider_history
+                    _dirty.add(AVAILABILITY_HISTORY_FILE)
             
-            # Save updated availability history
-            with open(AVAILABILITY_HISTORY_FILE, 'w') as f:
-                json.dump(availability_history, f)
-                
+            _buckets[AVAILABILITY_HISTORY_FILE] = current_hour
             logger.debug("Updated availability history")
             
         except Exception as e:
             logger.error(f"Error updating availability history: {str(e)}")
     
     def _update_network_latency(self):
-        """Update network latency data with a new data point"""
+        """Update network latency data with a new data point; call with _state_lock held"""
         try:
-            # Load current network latency data
-            if os.path.exists(NETWORK_LATENCY_FILE):
-                with open(NETWORK_LATENCY_FILE, 'r') as f:
-                    latency_data = json.load(f)
-            else:
-                latency_data = {provider: [] for provider in self.providers}
+            latency_data = _working_copy(NETWORK_LATENCY_FILE, {provider: [] for provider in self.providers})
             
             # Current timestamp
             current_time = datetime.now().timestamp()
             
+            # Latency variation range for the simulation mode
+            variation_range = _METRIC_RANGES[self.simulation_mode]["latency_variation"]
+            
             # Update for each provider
             for provider in self.providers:
                 provider_latency = latency_data.get(provider, [])
                 
                 # Get base latency for provider
-                base_latency = CLOUD_PROVIDERS[provider]["base_latency"]
+                base_latency = self._base_latency[provider]
                 
                 # Add random variation based on simulation mode
-                if self.simulation_mode == "normal":
-                    variation = random.uniform(-5, 10)
-                elif self.simulation_mode == "degraded":
-                    variation = random.uniform(10, 50)
-                else:  # failure
-                    variation = random.uniform(50, 200)
+                variation = random.uniform(*variation_range)
                 
                 # Occasionally add a latency spike
                 if random.random() < 0.05:
@@ -317,44 +383,35 @@ class PerformanceMonitor:
                     "latency": round(base_latency + variation, 1)
                 })
                 
-                # Keep only the last 50 data points
+                # Keep only the last 50 data points, trimming in place
                 if len(provider_latency) > 50:
-                    provider_latency = provider_latency[-50:]
+                    del provider_latency[:-50]
                 
                 latency_data[provider] = provider_latency
             
-            # Save updated network latency data
-            with open(NETWORK_LATENCY_FILE, 'w') as f:
-                json.dump(latency_data, f)
-                
+            _dirty.add(NETWORK_LATENCY_FILE)
             logger.debug("Updated network latency data")
             
         except Exception as e:
             logger.error(f"Error updating network latency: {str(e)}")
     
-    def _update_cost_history(self):
-        """Update cost history with a new data point"""
+    def _update_cost_history(self, active_provider):
+        """Update cost history with a new data point; call with _state_lock held"""
         try:
-            # Load current cost history
-            if os.path.exists(COST_HISTORY_FILE):
-                with open(COST_HISTORY_FILE, 'r') as f:
-                    cost_history = json.load(f)
-            else:
-                cost_history = {provider: [] for provider in self.providers}
-            
-            # Get active provider
-            active_provider = get_active_provider()
+            cost_history = _working_copy(COST_HISTORY_FILE, {provider: [] for provider in self.providers})
             
-            # Get current date
+            # Get current date, as epoch seconds
             now = datetime.now()
-            current_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            current_day = int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+            if current_day == _buckets.get(COST_HISTORY_FILE):
+                return
             
             # Update for each provider
             for provider in self.providers:
                 provider_history = cost_history.get(provider, [])
                 
                 # Check if we already have an entry for the current day
-                if not provider_history or datetime.fromisoformat(provider_history[-1]["timestamp"]).day != current_day.day:
+                if not provider_history or provider_history[-1]["timestamp"] // 86400 != current_day // 86400:
                     # Get provider cost info
                     provider_info = CLOUD_PROVIDERS[provider]
                     
@@ -368,23 +425,21 @@ class PerformanceMonitor:
                     
                     # Add new daily cost entry
                     provider_history.append({
-                        "timestamp": current_day.isoformat(),
+                        "timestamp": current_day,
                         "compute_cost": round(compute_cost, 2),
                         "storage_cost": round(storage_cost, 2),
                         "transfer_cost": round(transfer_cost, 2),
                         "total_cost": round(compute_cost + storage_cost + transfer_cost, 2)
                     })
                     
-                    # Keep only the last 30 days of data
+                    # Keep only the last 30 days of data, trimming in place
                     if len(provider_history) > 30:
-                        provider_history = provider_history[-30:]
+                        del provider_history[:-30]
                     
                     cost_history[provider] = provider_history
+                    _dirty.add(COST_HISTORY_FILE)
             
-            # Save updated cost history
-            with open(COST_HISTORY_FILE, 'w') as f:
-                json.dump(cost_history, f)
-                
+            _buckets[COST_HISTORY_FILE] = current_day
             logger.debug("Updated cost history")
             
         except Exception as e:
@@ -401,14 +456,27 @@ class PerformanceMonitor:
             return False
     
     def run_performance_monitor_thread(self, interval=60):
-        """Run performance monitoring in a loop at specified intervals"""
+        """Run performance monitoring in a loop, sampling more often while providers are in trouble"""
+        next_tick = time.monotonic()
         while True:
             try:
                 self.update_performance_data()
-                time.sleep(interval)
+                
+                # Twice as often while simulating degraded or failed providers or
+                # any provider is down, half as often while everything is normal
+                if self.simulation_mode != "normal" or not self._all_healthy:
+                    delay = interval / 2
+                else:
+                    delay = interval * 2
             except Exception as e:
                 logger.error(f"Error in performance monitor thread: {str(e)}")
-                time.sleep(10)  # Short delay before trying again
+                delay = 10  # Short delay before trying again
+            
+            # Schedule from the start of this tick so update time doesn't
+            # stretch the period; if a tick overran, start the next one now
+            now = time.monotonic()
+            next_tick = max(next_tick + delay, now)
+            time.sleep(next_tick - now)
     
     def start_monitoring(self, interval=60):
         """Start performance monitoring in a background thread"""
@@ -424,9 +492,9 @@ class PerformanceMonitor:
 def get_performance_data():
     """Get the current performance data"""
     try:
-        if os.path.exists(PERFORMANCE_DATA_FILE):
-            with open(PERFORMANCE_DATA_FILE, 'r') as f:
-                return json.load(f)
+        # Re-parsed only when the file changes; callers must not modify the result
+        return read_json_cached(PERFORMANCE_DATA_FILE)
+    except FileNotFoundError:
         return {}
     except Exception as e:
         logger.error(f"Error getting performance data: {str(e)}")
@@ -435,9 +503,9 @@ def get_performance_data():
 def get_availability_history():
     """Get the availability history"""
     try:
-        if os.path.exists(AVAILABILITY_HISTORY_FILE):
-            with open(AVAILABILITY_HISTORY_FILE, 'r') as f:
-                return json.load(f)
+        # Re-parsed only when the file changes; callers must not modify the result
+        return read_json_cached(AVAILABILITY_HISTORY_FILE)
+    except FileNotFoundError:
         return {}
     except Exception as e:
         logger.error(f"Error getting availability history: {str(e)}")
@@ -446,9 +514,9 @@ def get_availability_history():
 def get_cost_history():
     """Get the cost history"""
     try:
-        if os.path.exists(COST_HISTORY_FILE):
-            with open(COST_HISTORY_FILE, 'r') as f:
-                return json.load(f)
+        # Re-parsed only when the file changes; callers must not modify the result
+        return read_json_cached(COST_HISTORY_FILE)
+    except FileNotFoundError:
         return {}
     except Exception as e:
         logger.error(f"Error getting cost history: {str(e)}")
@@ -457,14 +525,38 @@ def get_cost_history():
 def get_network_latency():
     """Get the network latency data"""
     try:
-        if os.path.exists(NETWORK_LATENCY_FILE):
-            with open(NETWORK_LATENCY_FILE, 'r') as f:
-                return json.load(f)
+        # Re-parsed only when the file changes; callers must not modify the result
+        return read_json_cached(NETWORK_LATENCY_FILE)
+    except FileNotFoundError:
         return {}
     except Exception as e:
         logger.error(f"Error getting network latency: {str(e)}")
         return {}
 
+def _cached_until_changed(path):
+    """Memoize a summary of a data file until the file is rewritten"""
+    def decorator(func):
+        cache = {}
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Normalize positional, keyword and default arguments to one key
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+            
+            version = file_version(path)
+            cached = cache.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, func(*bound.args, **bound.kwargs))
+                cache[key] = cached
+            # Hand out a copy so callers can't change the cached summary
+            return dict(cached[1])
+        return wrapper
+    return decorator
+
+@_cached_until_changed(AVAILABILITY_HISTORY_FILE)
 def calculate_availability_percentage(provider=None):
     """Calculate availability percentage for the specified provider or all providers"""
     try:
@@ -494,6 +586,7 @@ def calculate_availability_percentage(provider=None):
         logger.error(f"Error calculating availability percentage: {str(e)}")
         return {}
 
+@_cached_until_changed(COST_HISTORY_FILE)
 def get_total_cost_by_provider():
     """Get the total cost for each provider over the entire history"""
     try:
@@ -516,9 +609,8 @@ if __name__ == "__main__":
     # When run directly, start performance monitoring
     monitor = PerformanceMonitor()
     monitor.start_monitoring()
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Performance monitoring stopped")
\ No newline at end of file
+    # Keep main thread alive, blocked until Ctrl+C instead of polling
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    stop.wait()
+    print("Performance monitoring stopped")
\ No newline at end of file